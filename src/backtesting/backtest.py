@@ -53,6 +53,9 @@ class Backtester:
         self.initial_capital = initial_capital
         self.commission = commission
         
+        # Entry + exit commission as a fraction of position size (used per trade)
+        self._round_trip_cost_rate = commission * 2
+        
         # Initialize components
         self.market_data = MarketDataFetcher(testnet=True)
         self.ml_predictor = MLPredictor()
@@ -249,6 +252,19 @@ class Backtester:
         if features is None or len(features) == 0:
             return {}
         
+        # Loop invariants, looked up once per period instead of per candle
+        risk_per_trade = self.risk_manager.risk_per_trade
+        has_atr = 'ATR' in features
+        
+        # ML predictions for all candles in one model call (row i only sees candle i)
+        try:
+            ml_predictions, ml_confidences = self.ml_predictor.predict_batch(
+                features.drop(columns=['target', 'Target'], errors='ignore')
+            )
+        except Exception as e:
+            logger.warning(f"[WARNING] Batch prediction failed, predicting per candle: {e}")
+            ml_predictions = ml_confidences = None
+        
         # Iterate through data (simulate real-time trading)
         for i in range(len(features)):
             current_data = features.iloc[:i+1]
@@ -259,7 +275,7 @@ class Backtester:
             
             # Get current price and ATR
             current_price = current_data['close'].iloc[-1]
-            current_atr = current_data['ATR'].iloc[-1] if 'ATR' in current_data else current_price * 0.02
+            current_atr = current_data['ATR'].iloc[-1] if has_atr else current_price * 0.02
             
             # Check for position exits first
             for position in positions[:]:
@@ -306,11 +322,16 @@ class Backtester:
             
             # Generate new signal if no positions
             if len(positions) == 0:
-                signal = self._generate_signal(current_data)
+                if ml_predictions is not None:
+                    signal = self._generate_signal(
+                        current_data, ml_prediction=(ml_predictions[i], ml_confidences[i])
+                    )
+                else:
+                    signal = self._generate_signal(current_data)
                 
                 if signal and signal['should_trade']:
                     # Calculate position size
-                    position_size = capital * self.risk_manager.risk_per_trade
+                    position_size = capital * risk_per_trade
                     quantity = position_size / current_price
                     
                     # Calculate SL/TP
@@ -365,27 +386,35 @@ class Backtester:
         
         return results
     
-    def _generate_signal(self, data: pd.DataFrame) -> Optional[Dict]:
+    def _generate_signal(
+        self,
+        data: pd.DataFrame,
+        ml_prediction: Optional[Tuple] = None
+    ) -> Optional[Dict]:
         """
         Generate trading signal using ML + Sentiment
         
         Args:
             data: DataFrame with features
+            ml_prediction: Precomputed (signal, confidence) for the last row (optional)
         
         Returns:
             Signal dictionary or None
         """
         try:
-            # ML prediction - pass last row as Series (without target column)
-            last_row = data.iloc[-1]
-            
-            # Remove target column if present
-            if 'target' in last_row.index:
-                last_row = last_row.drop(['target'])
-            if 'Target' in last_row.index:
-                last_row = last_row.drop(['Target'])
-            
-            ml_signal, ml_confidence = self.ml_predictor.predict_single(last_row)
+            if ml_prediction is not None:
+                ml_signal, ml_confidence = ml_prediction
+            else:
+                # ML prediction - pass last row as Series (without target column)
+                last_row = data.iloc[-1]
+                
+                # Remove target column if present
+                if 'target' in last_row.index:
+                    last_row = last_row.drop(['target'])
+                if 'Target' in last_row.index:
+                    last_row = last_row.drop(['Target'])
+                
+                ml_signal, ml_confidence = self.ml_predictor.predict_single(last_row)
             
             # Sentiment (use cached/neutral if no news)
             sentiment = {'score': 0.0, 'label': 'neutral'}
@@ -429,7 +458,7 @@ class Backtester:
             gross_pnl = (position['entry_price'] - exit_price) * position['quantity']
         
         # Subtract commissions (entry + exit)
-        commission = position['position_size'] * self.commission * 2
+        commission = position['position_size'] * self._round_trip_cost_rate
         net_pnl = gross_pnl - commission
         
         return net_pnl
@@ -463,34 +492,40 @@ class Backtester:
                 'profit_factor': 0
             }
         
+        pnls = np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades))
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
+        
         # Win rate
-        winning_trades = [t for t in trades if t['pnl'] > 0]
-        win_rate = (len(winning_trades) / len(trades)) * 100
+        win_rate = (len(wins) / len(trades)) * 100
         
         # Total return
         total_return = ((final_capital / self.initial_capital) - 1) * 100
         
-        # Max drawdown
-        max_drawdown = ((peak_capital - final_capital) / peak_capital) * 100 if peak_capital > 0 else 0
+        # Max drawdown over the trade-by-trade equity curve
+        equity = self.initial_capital + np.concatenate(([0.0], np.cumsum(pnls)))
+        peaks = np.maximum.accumulate(equity)
+        drawdowns = np.divide(peaks - equity, peaks, out=np.zeros_like(equity), where=peaks > 0)
+        max_drawdown = drawdowns.max() * 100
         
         # Profit factor
-        total_wins = sum(t['pnl'] for t in trades if t['pnl'] > 0)
-        total_losses = abs(sum(t['pnl'] for t in trades if t['pnl'] < 0))
+        total_wins = wins.sum()
+        total_losses = abs(losses.sum())
         profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
         
         # Sharpe ratio (simplified - using trade returns)
-        returns = [t['pnl_pct'] for t in trades]
+        returns = np.fromiter((t['pnl_pct'] for t in trades), dtype=np.float64, count=len(trades))
         if len(returns) > 1:
-            avg_return = np.mean(returns)
-            std_return = np.std(returns)
+            avg_return = returns.mean()
+            std_return = returns.std()
             sharpe_ratio = (avg_return / std_return) * np.sqrt(252) if std_return > 0 else 0
         else:
             sharpe_ratio = 0
         
         return {
             'total_trades': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(trades) - len(winning_trades),
+            'winning_trades': len(wins),
+            'losing_trades': len(trades) - len(wins),
             'win_rate': win_rate,
             'total_return': total_return,
             'final_capital': final_capital,
@@ -498,8 +533,8 @@ class Backtester:
             'max_drawdown': max_drawdown,
             'sharpe_ratio': sharpe_ratio,
             'profit_factor': profit_factor,
-            'avg_win': np.mean([t['pnl'] for t in trades if t['pnl'] > 0]) if winning_trades else 0,
-            'avg_loss': np.mean([t['pnl'] for t in trades if t['pnl'] < 0]) if len(trades) > len(winning_trades) else 0
+            'avg_win': wins.mean() if len(wins) else 0,
+            'avg_loss': losses.mean() if len(losses) else 0
         }
     
     def _aggregate_wf_results(self, all_results: List[Dict]) -> Dict:
@@ -585,12 +620,8 @@ class Backtester:
                 return
             
             # Build equity curve
-            capital = self.initial_capital
-            equity_curve = [capital]
-            
-            for trade in all_trades:
-                capital += trade['pnl']
-                equity_curve.append(capital)
+            pnls = np.fromiter((t['pnl'] for t in all_trades), dtype=np.float64, count=len(all_trades))
+            equity_curve = self.initial_capital + np.concatenate(([0.0], np.cumsum(pnls)))
             
             # Create plot
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
@@ -620,13 +651,9 @@ class Backtester:
                     fontsize=10, verticalalignment='top',
                     bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
             
-            # Plot 2: Drawdown
-            peak = self.initial_capital
-            drawdowns = []
-            for equity in equity_curve:
-                peak = max(peak, equity)
-                dd = ((peak - equity) / peak) * 100 if peak > 0 else 0
-                drawdowns.append(dd)
+            # Plot 2: Drawdown (equity_curve starts at initial capital)
+            peaks = np.maximum.accumulate(equity_curve)
+            drawdowns = np.divide(peaks - equity_curve, peaks, out=np.zeros_like(equity_curve), where=peaks > 0) * 100
             
             ax2.fill_between(range(len(drawdowns)), 0, drawdowns, 
                             color='#A23B72', alpha=0.6)
@@ -104,7 +104,8 @@ class MarketDataFetcher:
             df.set_index('timestamp', inplace=True)
             
             # Remove any duplicate columns (safety check)
-            df = df.loc[:, ~df.columns.duplicated()]
+            if df.columns.has_duplicates:
+                df = df.loc[:, ~df.columns.duplicated()]
             
             logger.info(f"[SUCCESS] Fetched {len(df)} candles from {df.index[0]} to {df.index[-1]}")
             return df
@@ -177,7 +178,8 @@ class MarketDataFetcher:
         df['momentum'] = df['close'].pct_change(periods=10)
         
         # Remove any duplicate columns that might have been added by indicators
-        df = df.loc[:, ~df.columns.duplicated()]
+        if df.columns.has_duplicates:
+            df = df.loc[:, ~df.columns.duplicated(keep='first')]
         
         logger.info(f"[SUCCESS] Added {len(df.columns) - 5} technical indicators")
         return df
@@ -249,10 +251,11 @@ class MarketDataFetcher:
         if 'Target' in df.columns:
             required_cols.append('Target')
         
-        # Remove duplicates from columns
-        df = df.loc[:, ~df.columns.duplicated()]
+        # Remove duplicates from columns (only copy the frame if there are any)
+        if df.columns.has_duplicates:
+            df = df.loc[:, ~df.columns.duplicated(keep='first')]
         
-        # Filter existing columns
+        # Filter existing columns (required_cols is unique, so the result is too)
         available_cols = [col for col in required_cols if col in df.columns]
         df_clean = df[available_cols].copy()
         
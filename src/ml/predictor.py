@@ -9,7 +9,7 @@ import numpy as np
 import pandas as pd
 import joblib
 from pathlib import Path
-from typing import Tuple, List, Optional, Dict
+from typing import BinaryIO, Tuple, List, Optional, Dict, Union
 from datetime import datetime, timedelta
 import logging
 
@@ -85,8 +85,9 @@ class MLPredictor:
         Returns:
             Tuple of (X_features, y_target, feature_names)
         """
-        # Remove duplicate columns first
-        df = df.loc[:, ~df.columns.duplicated()]
+        # Remove duplicate columns first (has_duplicates is cached on the Index)
+        if df.columns.has_duplicates:
+            df = df.loc[:, ~df.columns.duplicated()]
         
         # Get feature list from config
         feature_list = self.config.get('ml', 'features', default=[
@@ -263,7 +264,7 @@ class MLPredictor:
             raise ValueError("Model not trained - feature names not available")
         
         # Remove duplicate indices if any (like duplicate 'volume')
-        if features.index.duplicated().any():
+        if features.index.has_duplicates:
             # Keep only first occurrence of each feature
             features = features[~features.index.duplicated(keep='first')]
         
@@ -286,12 +287,44 @@ class MLPredictor:
         
         return prediction, confidence
     
+    def predict_batch(
+        self,
+        X: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict for many data points with one model call
+        
+        Row-by-row equivalent of predict_single: missing features default to 0,
+        duplicate columns keep their first occurrence, NaN becomes 0.
+        
+        Args:
+            X: Feature rows as DataFrame
+        
+        Returns:
+            Tuple of (predictions, confidences) arrays
+        """
+        if self.model is None:
+            raise ValueError("Model not trained or loaded")
+        if self.feature_names is None:
+            raise ValueError("Model not trained - feature names not available")
+        
+        if X.columns.has_duplicates:
+            X = X.loc[:, ~X.columns.duplicated(keep='first')]
+        X = X.reindex(columns=self.feature_names, fill_value=0).fillna(0)
+        
+        predictions = self.model.predict(X)
+        probabilities = self.model.predict_proba(X)
+        confidences = probabilities[np.arange(len(predictions)), predictions]
+        
+        return predictions, confidences
+    
     def walk_forward_validation(
         self,
         df: pd.DataFrame,
         train_days: int = None,
         test_days: int = None,
-        step_days: int = None
+        step_days: int = None,
+        max_folds: int = None
     ) -> List[Dict]:
         """
         Walk-Forward Validation to prevent data leakage
@@ -308,6 +341,7 @@ class MLPredictor:
             train_days: Training window size
             test_days: Test window size
             step_days: How many days to move forward
+            max_folds: Stop after this many folds (None = use all available data)
         
         Returns:
             List of validation results
@@ -341,6 +375,9 @@ class MLPredictor:
         fold = 1
         
         while start_idx + train_samples + test_samples <= len(X):
+            if max_folds is not None and fold > max_folds:
+                break
+            
             train_end = start_idx + train_samples
             test_end = train_end + test_samples
             
@@ -403,8 +440,8 @@ class MLPredictor:
         
         return results
     
-    def save_model(self, path: str = None):
-        """Save trained model to disk"""
+    def save_model(self, path: Union[str, Path, BinaryIO] = None):
+        """Save trained model to disk (or to a binary file-like object)"""
         if path is None:
             path = self.model_path
         
@@ -418,12 +455,12 @@ class MLPredictor:
         joblib.dump(model_data, path)
         logger.info(f"[SUCCESS] Model saved to {path}")
     
-    def load_model(self, path: str = None):
-        """Load trained model from disk"""
+    def load_model(self, path: Union[str, Path, BinaryIO] = None):
+        """Load trained model from disk (or from a binary file-like object)"""
         if path is None:
             path = self.model_path
         
-        if not Path(path).exists():
+        if isinstance(path, (str, Path)) and not Path(path).exists():
             raise FileNotFoundError(f"Model file not found: {path}")
         
         model_data = joblib.load(path)
@@ -0,0 +1,76 @@
+"""
+Risk Kernels
+============
+Scalar position-sizing math, JIT-compiled with numba when it is installed.
+"""
+
+# numba is optional: without it the kernels run as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _fixed_position_size_kernel(
+    capital: float,
+    risk_per_trade: float,
+    max_position_size: float,
+    entry_price: float,
+    stop_loss: float
+):
+    """
+    Fixed percentage risk position size
+    
+    The stop must differ from the entry price; the caller handles the
+    zero-risk case (see RiskManager._fixed_position_size).
+    
+    Args:
+        capital: Current capital
+        risk_per_trade: Fraction of capital risked per trade
+        max_position_size: Maximum position as a fraction of capital
+        entry_price: Entry price
+        stop_loss: Stop-loss price
+    
+    Returns:
+        Tuple of (position_size_usdt, quantity_coins)
+    """
+    price_risk = abs(entry_price - stop_loss)
+    position_size = capital * risk_per_trade / (price_risk / entry_price)
+    position_size = min(position_size, capital * max_position_size)
+    return position_size, position_size / entry_price
+
+
+@njit(cache=True)
+def _kelly_position_size_kernel(
+    capital: float,
+    max_position_size: float,
+    entry_price: float,
+    win_rate: float,
+    avg_win_loss_ratio: float
+):
+    """
+    Half-Kelly position size, bounded to [1%, max_position_size] of capital
+    
+    Args:
+        capital: Current capital
+        max_position_size: Maximum position as a fraction of capital
+        entry_price: Entry price
+        win_rate: Historical win rate
+        avg_win_loss_ratio: Average win/loss ratio
+    
+    Returns:
+        Tuple of (position_size_usdt, quantity_coins, kelly_pct)
+    """
+    kelly_pct = (win_rate - (1.0 - win_rate) / avg_win_loss_ratio) * 0.5
+    kelly_pct = max(0.01, min(kelly_pct, max_position_size))
+    
+    position_size = capital * kelly_pct
+    return position_size, position_size / entry_price, kelly_pct
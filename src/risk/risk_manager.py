@@ -6,11 +6,13 @@ Monitors drawdown and enforces risk limits.
 """
 
 import logging
-from typing import Dict, Tuple, Optional
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Optional
 import numpy as np
 from datetime import datetime
 
 from ..config.config_loader import get_config
+from ._kernels import _fixed_position_size_kernel, _kelly_position_size_kernel
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,26 @@ class RiskManager:
     Manages risk parameters for trading
     """
     
+    # Price direction per position side (anything other than 'long' is treated as short)
+    _SIDE_SIGN = {'long': 1.0, 'short': -1.0}
+    
+    # Closed trades kept in memory (full history lives in TradeLogger)
+    MAX_TRADE_HISTORY = 1000
+    
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        'config',
+        'initial_capital', 'current_capital', 'peak_capital',
+        'risk_per_trade', 'max_position_size', 'max_open_positions',
+        'max_drawdown', 'max_daily_trades',
+        'sl_atr_mult', 'tp_atr_mult', 'leverage',
+        '_drawdown_floor', '_min_capital',
+        'open_positions', 'trade_history',
+        '_n_trades', '_n_wins', '_n_losses', '_sum_wins', '_sum_losses', '_total_pnl', '_cached_metrics',
+        'daily_trades', 'last_trade_date',
+        'total_pnl', 'current_drawdown', 'max_positions'
+    )
+    
     def __init__(self, initial_capital: float = None):
         """
         Initialize risk manager
@@ -41,6 +63,7 @@ class RiskManager:
         self.max_position_size = self.config.get('risk', 'max_position_size', default=0.1)
         self.max_open_positions = self.config.get('risk', 'max_open_positions', default=3)
         self.max_drawdown = self.config.get('risk', 'max_drawdown_percent', default=15.0) / 100
+        self.max_daily_trades = self.config.get('risk', 'max_daily_trades', default=10)
         
         # Stop-loss and take-profit multipliers
         self.sl_atr_mult = self.config.get('risk', 'stop_loss_atr_multiplier', default=2.0)
@@ -49,11 +72,20 @@ class RiskManager:
         # Leverage
         self.leverage = self.config.get('risk', 'leverage', default=1)
         
-        # Position tracking
-        self.open_positions = []
+        # Capital thresholds checked by can_open_position
+        self._update_risk_thresholds()
+        
+        # Position tracking (keyed by symbol, one position per symbol)
+        self.open_positions: Dict[str, Dict] = {}
         self.daily_trades = 0
         self.last_trade_date = None
         
+        # Closed trades: running totals are the single source of performance
+        # metrics (O(1) per trade, cached between trades); trade_history only
+        # keeps the most recent trade records for inspection
+        self.trade_history: Deque[Dict] = deque(maxlen=self.MAX_TRADE_HISTORY)
+        self._reset_trade_stats()
+        
         # P&L tracking (for web interface compatibility)
         self.total_pnl = 0.0
         self.current_drawdown = 0.0
@@ -86,6 +118,56 @@ class RiskManager:
         else:
             raise ValueError(f"Unknown position sizing method: {method}")
     
+    def calculate_position_size_batch(
+        self,
+        entry_prices: np.ndarray,
+        stop_losses: np.ndarray,
+        capital=None,
+        method: str = 'fixed',
+        win_rate=0.55,
+        avg_win_loss_ratio: float = 1.5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized position sizing for many entries at once (parameter sweeps, backtests)
+        
+        Same math as calculate_position_size, broadcast over arrays; no per-entry logging.
+        
+        Args:
+            entry_prices: Entry prices
+            stop_losses: Stop-loss prices
+            capital: Capital per entry (scalar or array, default: current capital)
+            method: 'fixed' or 'kelly' (Kelly Criterion)
+            win_rate: Win rate for Kelly sizing (scalar or array)
+            avg_win_loss_ratio: Average win/loss ratio for Kelly sizing
+        
+        Returns:
+            Tuple of (position_sizes_usdt, quantities_coins) arrays
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        stop_losses = np.asarray(stop_losses, dtype=np.float64)
+        capital = np.asarray(self.current_capital if capital is None else capital, dtype=np.float64)
+        
+        if method == 'fixed':
+            price_risk = np.abs(entry_prices - stop_losses)
+            # Zero-distance stops fall back to the minimum position
+            safe_risk = np.where(price_risk > 0, price_risk, 1.0)
+            position_sizes = np.where(
+                price_risk > 0,
+                capital * self.risk_per_trade * entry_prices / safe_risk,
+                capital * 0.01
+            )
+            position_sizes = np.minimum(position_sizes, capital * self.max_position_size)
+        elif method == 'kelly':
+            win_rate = np.asarray(win_rate, dtype=np.float64)
+            kelly_pct = (win_rate - (1 - win_rate) / avg_win_loss_ratio) * 0.5
+            kelly_pct = np.clip(kelly_pct, 0.01, max(0.01, self.max_position_size))
+            shape = np.broadcast(capital * kelly_pct, entry_prices, stop_losses).shape
+            position_sizes = np.broadcast_to(capital * kelly_pct, shape).copy()
+        else:
+            raise ValueError(f"Unknown position sizing method: {method}")
+        
+        return position_sizes, position_sizes / entry_prices
+    
     def _fixed_position_size(
         self,
         entry_price: float,
@@ -101,25 +183,20 @@ class RiskManager:
         Returns:
             Tuple of (position_size_usdt, quantity_coins)
         """
-        # Risk amount in USDT
-        risk_amount = self.current_capital * self.risk_per_trade
-        
-        # Price distance to stop-loss
-        price_risk = abs(entry_price - stop_loss)
-        
-        if price_risk == 0:
+        # Degenerate zero-risk stop: minimum position (the kernel assumes non-zero risk)
+        if entry_price == stop_loss:
             logger.warning("[WARNING] Stop-loss equals entry price, using min position")
-            position_size = self.current_capital * 0.01
-        else:
-            # Position size = Risk Amount / (Price Risk / Entry Price)
-            position_size = risk_amount / (price_risk / entry_price)
+            position_size = self.current_capital * min(0.01, self.max_position_size)
+            return position_size, position_size / entry_price
         
-        # Apply maximum position size limit
-        max_position = self.current_capital * self.max_position_size
-        position_size = min(position_size, max_position)
+        # Risk amount in USDT
+        risk_amount = self.current_capital * self.risk_per_trade
         
-        # Calculate quantity
-        quantity = position_size / entry_price
+        # Position size = Risk Amount / (Price Risk / Entry Price), capped at max position
+        position_size, quantity = _fixed_position_size_kernel(
+            float(self.current_capital), float(self.risk_per_trade), float(self.max_position_size),
+            float(entry_price), float(stop_loss)
+        )
         
         logger.info(f"[RISK] Fixed sizing: ${position_size:.2f} USDT ({quantity:.6f} coins)")
         logger.info(f"[RISK] Risk: ${risk_amount:.2f} ({self.risk_per_trade:.2%} of capital)")
@@ -148,18 +225,11 @@ class RiskManager:
         Returns:
             Tuple of (position_size_usdt, quantity_coins)
         """
-        # Calculate Kelly percentage
-        kelly_pct = win_rate - ((1 - win_rate) / avg_win_loss_ratio)
-        
-        # Use fractional Kelly (50% of full Kelly for safety)
-        kelly_pct = kelly_pct * 0.5
-        
-        # Ensure reasonable bounds
-        kelly_pct = max(0.01, min(kelly_pct, self.max_position_size))
-        
-        # Calculate position size
-        position_size = self.current_capital * kelly_pct
-        quantity = position_size / entry_price
+        # Half Kelly (50% of full Kelly for safety), bounded to [1%, max_position_size]
+        position_size, quantity, kelly_pct = _kelly_position_size_kernel(
+            float(self.current_capital), float(self.max_position_size),
+            float(entry_price), float(win_rate), float(avg_win_loss_ratio)
+        )
         
         logger.info(f"[RISK] Kelly sizing: {kelly_pct:.2%} of capital = ${position_size:.2f}")
         
@@ -182,10 +252,8 @@ class RiskManager:
         Returns:
             Stop-loss price
         """
-        if direction == 'long':
-            stop_loss = entry_price - (atr * self.sl_atr_mult)
-        else:  # short
-            stop_loss = entry_price + (atr * self.sl_atr_mult)
+        # Below entry for longs, above for shorts
+        stop_loss = entry_price - self._SIDE_SIGN.get(direction, -1.0) * atr * self.sl_atr_mult
         
         logger.info(f"[RISK] Stop-loss ({direction}): ${stop_loss:.2f} (ATR: {atr:.2f})")
         
@@ -208,44 +276,80 @@ class RiskManager:
         Returns:
             Take-profit price
         """
-        if direction == 'long':
-            take_profit = entry_price + (atr * self.tp_atr_mult)
-        else:  # short
-            take_profit = entry_price - (atr * self.tp_atr_mult)
+        # Above entry for longs, below for shorts
+        take_profit = entry_price + self._SIDE_SIGN.get(direction, -1.0) * atr * self.tp_atr_mult
         
         logger.info(f"[RISK] Take-profit ({direction}): ${take_profit:.2f} (ATR: {atr:.2f})")
         
         return take_profit
     
-    def can_open_position(self) -> Tuple[bool, str]:
+    def check_exits_batch(
+        self,
+        prices: np.ndarray,
+        stop_losses: np.ndarray,
+        take_profits: np.ndarray,
+        sides: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized stop-loss / take-profit check for many open positions at once
+        
+        Same rules as the per-position exit checks in the executor and backtester;
+        stop-loss takes priority when both levels are crossed.
+        
+        Args:
+            prices: Current price per position
+            stop_losses: Stop-loss price per position
+            take_profits: Take-profit price per position
+            sides: Direction per position (+1 long, -1 short)
+        
+        Returns:
+            Tuple of (stop_loss_hit, take_profit_hit) boolean arrays
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        sides = np.asarray(sides, dtype=np.float64)
+        
+        # Longs exit at price <= stop / >= target; the side sign mirrors this for shorts
+        stop_hit = sides * (prices - np.asarray(stop_losses, dtype=np.float64)) <= 0
+        take_hit = ~stop_hit & (sides * (prices - np.asarray(take_profits, dtype=np.float64)) >= 0)
+        
+        return stop_hit, take_hit
+    
+    def can_open_position(self, symbol: Optional[str] = None) -> Tuple[bool, str]:
         """
         Check if a new position can be opened
         
+        Only one position per symbol is allowed, so a symbol that already
+        has an open position is refused.
+        
+        Args:
+            symbol: Trading symbol of the new position (optional)
+        
         Returns:
             Tuple of (can_trade: bool, reason: str)
         """
-        # Check drawdown
-        current_drawdown = self.get_current_drawdown()
-        if current_drawdown >= self.max_drawdown:
-            return False, f"Max drawdown exceeded: {current_drawdown:.2%}"
+        # Cheapest and most frequently failing checks first: open positions
+        if symbol is not None and symbol in self.open_positions:
+            return False, f"Position already open for {symbol}"
         
-        # Check number of open positions
         if len(self.open_positions) >= self.max_open_positions:
             return False, f"Max open positions reached: {len(self.open_positions)}/{self.max_open_positions}"
         
+        # Check drawdown against the precomputed capital floor
+        if self.current_capital <= self._drawdown_floor:
+            return False, f"Max drawdown exceeded: {self.get_current_drawdown():.2%}"
+        
         # Check daily trade limit
-        max_daily = self.config.get('risk', 'max_daily_trades', default=10)
         today = datetime.now().date()
         
         if self.last_trade_date != today:
             self.daily_trades = 0
             self.last_trade_date = today
         
-        if self.daily_trades >= max_daily:
-            return False, f"Daily trade limit reached: {self.daily_trades}/{max_daily}"
+        if self.daily_trades >= self.max_daily_trades:
+            return False, f"Daily trade limit reached: {self.daily_trades}/{self.max_daily_trades}"
         
         # Check minimum capital
-        if self.current_capital < self.initial_capital * 0.5:
+        if self.current_capital < self._min_capital:
             return False, f"Capital too low: ${self.current_capital:.2f} < 50% of initial"
         
         return True, "OK"
@@ -258,10 +362,13 @@ class RiskManager:
         stop_loss: float,
         take_profit: float,
         direction: str = 'long'
-    ) -> Dict:
+    ) -> Optional[Dict]:
         """
         Register a new open position
         
+        Positions are keyed by symbol, so only one position per symbol can be
+        open at a time; a second one for the same symbol is rejected.
+        
         Args:
             symbol: Trading symbol
             entry_price: Entry price
@@ -271,8 +378,12 @@ class RiskManager:
             direction: 'long' or 'short'
         
         Returns:
-            Position dictionary
+            Position dictionary, or None if the symbol already has an open position
         """
+        if symbol in self.open_positions:
+            logger.warning(f"[WARNING] Position already open for {symbol}, not adding another")
+            return None
+        
         position = {
             'symbol': symbol,
             'entry_price': entry_price,
@@ -284,7 +395,7 @@ class RiskManager:
             'position_value': entry_price * quantity
         }
         
-        self.open_positions.append(position)
+        self.open_positions[symbol] = position
         self.daily_trades += 1
         
         logger.info(f"[RISK] Position opened: {symbol} {direction.upper()} {quantity:.6f} @ ${entry_price:.2f}")
@@ -307,11 +418,7 @@ class RiskManager:
         Returns:
             Closed position with PnL data, or None if not found
         """
-        position = None
-        for i, pos in enumerate(self.open_positions):
-            if pos['symbol'] == symbol:
-                position = self.open_positions.pop(i)
-                break
+        position = self.open_positions.pop(symbol, None)
         
         if not position:
             logger.warning(f"[WARNING] Position not found: {symbol}")
@@ -335,11 +442,13 @@ class RiskManager:
         # Update peak capital for drawdown calculation
         if self.current_capital > self.peak_capital:
             self.peak_capital = self.current_capital
+            self._update_risk_thresholds()
         
         position['exit_price'] = exit_price
         position['exit_time'] = datetime.now()
         position['pnl'] = pnl
         position['pnl_pct'] = pnl_pct
+        self.update_trade_history(position)
         
         logger.info(f"[RISK] Position closed: {symbol} @ ${exit_price:.2f}")
         logger.info(f"[RISK] PnL: ${pnl:+.2f} ({pnl_pct:+.2f}%)")
@@ -368,7 +477,7 @@ class RiskManager:
             Dictionary with risk metrics
         """
         drawdown = self.get_current_drawdown()
-        total_exposure = sum(pos['position_value'] for pos in self.open_positions)
+        total_exposure = sum(pos['position_value'] for pos in self.open_positions.values())
         exposure_pct = (total_exposure / self.current_capital) if self.current_capital > 0 else 0
         
         return {
@@ -384,6 +493,98 @@ class RiskManager:
             'return_pct': ((self.current_capital / self.initial_capital) - 1) * 100
         }
     
+    def update_trade_history(self, trade: Dict):
+        """
+        Record a closed trade for performance statistics
+        
+        Only the last MAX_TRADE_HISTORY trades are kept in trade_history.
+        
+        Args:
+            trade: Trade dictionary with at least 'pnl'
+        """
+        pnl = float(trade['pnl'])
+        self.trade_history.append(trade)
+        self._n_trades += 1
+        
+        if pnl > 0:
+            self._n_wins += 1
+            self._sum_wins += pnl
+        elif pnl < 0:
+            self._n_losses += 1
+            self._sum_losses += pnl
+        self._total_pnl += pnl
+        self._cached_metrics = None
+    
+    def bulk_update_trade_history(self, trades: List[Dict]):
+        """
+        Record several closed trades at once
+        
+        Args:
+            trades: List of trade dictionaries with at least 'pnl'
+        """
+        pnls = np.array([t['pnl'] for t in trades], dtype=np.float64)
+        self.trade_history.extend(trades)
+        self._n_trades += pnls.size
+        
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
+        self._n_wins += wins.size
+        self._sum_wins += float(wins.sum())
+        self._n_losses += losses.size
+        self._sum_losses += float(losses.sum())
+        self._total_pnl += float(pnls.sum())
+        self._cached_metrics = None
+    
+    def get_performance_metrics(self) -> Dict:
+        """
+        Get performance statistics over all recorded trades
+        
+        Built from running totals kept by update_trade_history and
+        bulk_update_trade_history, and cached until the next recorded trade.
+        Trades already dropped from trade_history still count.
+        
+        Returns:
+            Dictionary with performance metrics (win_rate as a fraction)
+        """
+        if self._cached_metrics is None:
+            n_trades = self._n_trades
+            n_wins = self._n_wins
+            n_losses = self._n_losses
+            total_losses = -self._sum_losses
+            
+            self._cached_metrics = {
+                'total_trades': n_trades,
+                'winning_trades': n_wins,
+                'losing_trades': n_losses,
+                'win_rate': (n_wins / n_trades) if n_trades > 0 else 0.0,
+                'total_pnl': self._total_pnl,
+                'avg_win': (self._sum_wins / n_wins) if n_wins else 0.0,
+                'avg_loss': (self._sum_losses / n_losses) if n_losses else 0.0,
+                'profit_factor': (self._sum_wins / total_losses) if total_losses > 0 else 0.0
+            }
+        
+        # Copy so callers cannot modify the cached dictionary
+        return dict(self._cached_metrics)
+    
+    def _update_risk_thresholds(self):
+        """Recompute capital thresholds after initial or peak capital changes"""
+        # Capital at which drawdown from peak reaches max_drawdown (never hit without a peak)
+        if self.peak_capital > 0:
+            self._drawdown_floor = self.peak_capital * (1 - self.max_drawdown)
+        else:
+            self._drawdown_floor = float('-inf')
+        self._min_capital = self.initial_capital * 0.5
+    
+    def _reset_trade_stats(self):
+        """Clear running trade totals and the cached performance metrics"""
+        self._n_trades = 0
+        self._n_wins = 0
+        self._n_losses = 0
+        self._sum_wins = 0.0
+        self._sum_losses = 0.0
+        self._total_pnl = 0.0
+        self._cached_metrics = None
+    
     def reset(self, capital: float = None):
         """
         Reset risk manager (for backtesting)
@@ -396,7 +597,10 @@ class RiskManager:
         
         self.current_capital = self.initial_capital
         self.peak_capital = self.initial_capital
-        self.open_positions = []
+        self._update_risk_thresholds()
+        self.open_positions = {}
+        self.trade_history = deque(maxlen=self.MAX_TRADE_HISTORY)
+        self._reset_trade_stats()
         self.daily_trades = 0
         self.last_trade_date = None
         
@@ -8,6 +8,7 @@ Sentiment: TextBlob (basic) with preparation for FinBERT migration.
 
 import requests
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from textblob import TextBlob
@@ -21,6 +22,12 @@ from ..config.config_loader import get_config
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _text_polarity(text: str) -> float:
+    """TextBlob polarity of a single text (-1 to 1), memoized per text"""
+    return TextBlob(text).sentiment.polarity
+
+
 class NewsAnalyzer:
     """
     Analyzes sentiment from cryptocurrency news sources
@@ -49,8 +56,20 @@ class NewsAnalyzer:
         # Cache storage
         self._cache: Dict[str, Tuple[datetime, float]] = {}
         
+        # Pooled HTTP sessions reuse TLS connections; requests.Session is not
+        # thread-safe, so each thread gets its own
+        self._local = threading.local()
+        
         logger.info("[SENTIMENT] News Analyzer initialized")
     
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of the calling thread (created on first use)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
     def get_sentiment(
         self,
         symbol: str = "BTC",
@@ -166,7 +185,7 @@ class NewsAnalyzer:
         }
         
         try:
-            response = requests.get(self.cryptopanic_url, params=params, timeout=10)
+            response = self.session.get(self.cryptopanic_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -229,7 +248,7 @@ class NewsAnalyzer:
         }
         
         try:
-            response = requests.get(self.newsapi_url, params=params, timeout=10)
+            response = self.session.get(self.newsapi_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -267,9 +286,8 @@ class NewsAnalyzer:
         
         for text in texts:
             try:
-                # TextBlob sentiment analysis
-                blob = TextBlob(text)
-                polarity = blob.sentiment.polarity  # -1 (negative) to 1 (positive)
+                # TextBlob sentiment analysis (headlines repeat across calls, so cached)
+                polarity = _text_polarity(text)  # -1 (negative) to 1 (positive)
                 sentiments.append(polarity)
                 
             except Exception as e:
@@ -202,7 +202,8 @@ class TradingExecutor:
         df = self.data_fetcher.prepare_features(df)
         
         # Remove duplicate columns
-        df = df.loc[:, ~df.columns.duplicated()]
+        if df.columns.has_duplicates:
+            df = df.loc[:, ~df.columns.duplicated()]
         
         # Get current market state
         current_price = df['close'].iloc[-1]
@@ -221,7 +222,7 @@ class TradingExecutor:
         X, y, features = self.predictor.prepare_data(df)
         last_row = X.iloc[-1]
         
-        if isinstance(last_row, pd.Series) and last_row.index.duplicated().any():
+        if isinstance(last_row, pd.Series) and last_row.index.has_duplicates:
             last_row = last_row[~last_row.index.duplicated(keep='first')]
         
         ml_prediction, ml_confidence = self.predictor.predict_single(last_row)
@@ -282,7 +283,7 @@ class TradingExecutor:
             return False, f"Sentiment too negative: {analysis['sentiment_score']:.4f} < {self.sentiment_threshold}", None
         
         # Check risk management
-        can_trade, risk_reason = self.risk_manager.can_open_position()
+        can_trade, risk_reason = self.risk_manager.can_open_position(analysis['symbol'])
         if not can_trade:
             return False, f"Risk check failed: {risk_reason}", None
         
@@ -310,6 +311,11 @@ class TradingExecutor:
         current_price = analysis['price']
         atr = analysis['atr']
         
+        # One position per symbol: refuse before sizing or sending any order
+        if symbol in self.risk_manager.open_positions:
+            logger.warning(f"[EXECUTE] Position already open for {symbol}, trade skipped")
+            return None
+        
         # Calculate stop-loss and take-profit
         stop_loss = self.risk_manager.calculate_stop_loss(current_price, atr, direction)
         take_profit = self.risk_manager.calculate_take_profit(current_price, atr, direction)
@@ -398,6 +404,8 @@ class TradingExecutor:
             take_profit=take_profit,
             direction=direction
         )
+        if position is None:
+            return None
         
         # Log trade to database
         trade_id = self.trade_logger.log_trade_open(
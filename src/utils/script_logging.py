@@ -0,0 +1,41 @@
+"""
+Script Logging
+==============
+Shared logging setup for the root-level test scripts.
+"""
+
+import logging
+from typing import Optional
+
+
+CONSOLE_FORMAT = '%(name)s - %(levelname)s - %(message)s'
+FILE_FORMAT = '%(asctime)s - ' + CONSOLE_FORMAT
+
+
+def setup_logging(log_file: Optional[str] = None):
+    """
+    Configure root logging for a test script
+    
+    Does nothing once the root logger has handlers, so repeated calls (with
+    any log_file) are no-ops. The console drops timestamps on an interactive
+    terminal; the log file, if given, always keeps them.
+    
+    Args:
+        log_file: Optional path of a log file to write as well
+    """
+    # Already configured: build nothing, so no file is opened and leaked
+    if logging.getLogger().handlers:
+        return
+    
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(
+        CONSOLE_FORMAT if console.stream.isatty() else FILE_FORMAT
+    ))
+    handlers = [console]
+    
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(file_handler)
+    
+    logging.basicConfig(level=logging.INFO, handlers=handlers)
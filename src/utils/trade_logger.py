@@ -6,8 +6,10 @@ Logs all trades and system events to SQLite database.
 
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import pandas as pd
 
@@ -22,109 +24,243 @@ class TradeLogger:
     Logs trades and events to SQLite database
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pragmas: Dict[str, str] = None):
         """
         Initialize trade logger
         
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file (':memory:' for an in-memory database)
+            pragmas: PRAGMA settings applied to every connection
+                     (e.g. {'synchronous': 'OFF'} for throwaway test databases)
         """
         self.config = get_config()
         
         if db_path is None:
             db_path = self.config.get('logging', 'database', 'path', default='data/trading.db')
         
+        self.in_memory = str(db_path) == ':memory:'
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pragmas = pragmas or {}
+        
+        # Per-thread bulk() transaction: a connection is never used by another thread
+        self._local = threading.local()
+        
+        # An in-memory database lives only as long as its connection, so keep a
+        # single connection for the logger's lifetime, shared between threads under a lock
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._memory_lock = threading.RLock()
+        if self.in_memory:
+            self._memory_conn = self._open_connection()
         
         # Initialize database
         self._init_database()
         
         logger.info(f"[DB] Trade Logger initialized: {self.db_path}")
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new connection with the configured PRAGMAs applied"""
+        if self.in_memory:
+            # Shared between threads; every use is serialized by _memory_lock
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+    
+    def _get_memory_connection(self) -> sqlite3.Connection:
+        """Return the in-memory connection (caller holds _memory_lock)"""
+        if self._memory_conn is None:
+            # A reopened :memory: database would be empty, so refuse instead
+            raise RuntimeError("In-memory TradeLogger is closed")
+        return self._memory_conn
+    
+    def close(self):
+        """
+        Close the in-memory connection; its database is discarded and the
+        logger cannot be used afterwards. File-backed loggers hold no
+        connection between operations, so this is a no-op for them.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            # Inside bulk(): the transaction still needs the connection
+            return
+        
+        with self._memory_lock:
+            if self._memory_conn is not None:
+                self._memory_conn.close()
+                self._memory_conn = None
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Get a connection for one operation
+        
+        Outside bulk() every operation on a file database opens, commits and
+        closes its own connection; an in-memory database reuses its single
+        connection under the lock. Inside bulk() the calling thread's bulk
+        connection is reused and the commit is left to bulk().
+        """
+        bulk_conn = getattr(self._local, 'conn', None)
+        if bulk_conn is not None:
+            yield bulk_conn
+            return
+        
+        if self.in_memory:
+            with self._memory_lock:
+                conn = self._get_memory_connection()
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            return
+        
+        conn = self._open_connection()
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+    
+    @contextmanager
+    def bulk(self) -> Iterator['TradeLogger']:
+        """
+        Group several log_* calls into a single transaction
+        
+        The transaction belongs to the calling thread; other threads keep
+        using their own connections (or wait for the in-memory lock).
+        
+        Example:
+            with trade_logger.bulk():
+                trade_logger.log_event(...)
+                trade_logger.log_analysis(...)
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            # Nested bulk() joins the outer transaction
+            yield self
+            return
+        
+        if self.in_memory:
+            self._memory_lock.acquire()
+            try:
+                conn = self._get_memory_connection()
+            except Exception:
+                self._memory_lock.release()
+                raise
+        else:
+            conn = self._open_connection()
+        self._local.conn = conn
+        
+        try:
+            yield self
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            if self.in_memory:
+                self._memory_lock.release()
+            else:
+                conn.close()
+    
     def _init_database(self):
         """Create database tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Trades table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,
-                entry_price REAL NOT NULL,
-                exit_price REAL,
-                quantity REAL NOT NULL,
-                position_size REAL NOT NULL,
-                stop_loss REAL,
-                take_profit REAL,
-                direction TEXT NOT NULL,
-                status TEXT NOT NULL,
-                pnl REAL,
-                pnl_pct REAL,
-                ml_confidence REAL,
-                sentiment_score REAL,
-                order_id TEXT,
-                exit_reason TEXT,
-                entry_time TEXT NOT NULL,
-                exit_time TEXT,
-                duration_seconds INTEGER
-            )
-        ''')
-        
-        # Events table (system events, errors, etc.)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                event_type TEXT NOT NULL,
-                severity TEXT NOT NULL,
-                message TEXT NOT NULL,
-                details TEXT
-            )
-        ''')
-        
-        # Performance metrics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                capital REAL NOT NULL,
-                peak_capital REAL NOT NULL,
-                drawdown REAL NOT NULL,
-                open_positions INTEGER NOT NULL,
-                total_exposure REAL NOT NULL,
-                daily_trades INTEGER NOT NULL,
-                total_pnl REAL NOT NULL,
-                win_rate REAL,
-                avg_win REAL,
-                avg_loss REAL,
-                sharpe_ratio REAL
-            )
-        ''')
-        
-        # Market analysis table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS analysis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                symbol TEXT NOT NULL,
-                price REAL NOT NULL,
-                atr REAL NOT NULL,
-                rsi REAL,
-                ml_signal TEXT NOT NULL,
-                ml_confidence REAL NOT NULL,
-                sentiment_score REAL NOT NULL,
-                sentiment_label TEXT NOT NULL,
-                decision TEXT NOT NULL,
-                reason TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Trades table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    side TEXT NOT NULL,
+                    entry_price REAL NOT NULL,
+                    exit_price REAL,
+                    quantity REAL NOT NULL,
+                    position_size REAL NOT NULL,
+                    stop_loss REAL,
+                    take_profit REAL,
+                    direction TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    pnl REAL,
+                    pnl_pct REAL,
+                    ml_confidence REAL,
+                    sentiment_score REAL,
+                    order_id TEXT,
+                    exit_reason TEXT,
+                    entry_time TEXT NOT NULL,
+                    exit_time TEXT,
+                    duration_seconds INTEGER
+                )
+            ''')
+            
+            # Events table (system events, errors, etc.)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    details TEXT
+                )
+            ''')
+            
+            # Performance metrics table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    capital REAL NOT NULL,
+                    peak_capital REAL NOT NULL,
+                    drawdown REAL NOT NULL,
+                    open_positions INTEGER NOT NULL,
+                    total_exposure REAL NOT NULL,
+                    daily_trades INTEGER NOT NULL,
+                    total_pnl REAL NOT NULL,
+                    win_rate REAL,
+                    avg_win REAL,
+                    avg_loss REAL,
+                    sharpe_ratio REAL
+                )
+            ''')
+            
+            # Market analysis table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS analysis (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    atr REAL NOT NULL,
+                    rsi REAL,
+                    ml_signal TEXT NOT NULL,
+                    ml_confidence REAL NOT NULL,
+                    sentiment_score REAL NOT NULL,
+                    sentiment_label TEXT NOT NULL,
+                    decision TEXT NOT NULL,
+                    reason TEXT
+                )
+            ''')
+            
+            # Indexes for the "filter + ORDER BY timestamp DESC LIMIT n" queries
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trades_status_ts
+                ON trades(status, timestamp DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_events_ts
+                ON events(timestamp DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analysis_symbol_ts
+                ON analysis(symbol, timestamp DESC)
+            ''')
         
         logger.info("[DB] Database tables initialized")
     
@@ -161,26 +297,24 @@ class TradeLogger:
         Returns:
             Trade ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        timestamp = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO trades (
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            timestamp = datetime.now().isoformat()
+            
+            cursor.execute('''
+                INSERT INTO trades (
+                    timestamp, symbol, side, entry_price, quantity, position_size,
+                    stop_loss, take_profit, direction, status, ml_confidence,
+                    sentiment_score, order_id, entry_time
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
                 timestamp, symbol, side, entry_price, quantity, position_size,
-                stop_loss, take_profit, direction, status, ml_confidence,
-                sentiment_score, order_id, entry_time
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            timestamp, symbol, side, entry_price, quantity, position_size,
-            stop_loss, take_profit, direction, 'open', ml_confidence,
-            sentiment_score, order_id, timestamp
-        ))
-        
-        trade_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+                stop_loss, take_profit, direction, 'open', ml_confidence,
+                sentiment_score, order_id, timestamp
+            ))
+            
+            trade_id = cursor.lastrowid
         
         logger.info(f"[DB] Trade opened: ID={trade_id}, {symbol} {direction.upper()}")
         
@@ -204,31 +338,28 @@ class TradeLogger:
             pnl_pct: Profit/Loss percentage
             exit_reason: Reason for closing (stop_loss, take_profit, manual, etc.)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        exit_time = datetime.now().isoformat()
-        
-        # Get entry time to calculate duration
-        cursor.execute('SELECT entry_time FROM trades WHERE id = ?', (trade_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            entry_time = datetime.fromisoformat(result[0])
-            exit_datetime = datetime.fromisoformat(exit_time)
-            duration = int((exit_datetime - entry_time).total_seconds())
-        else:
-            duration = None
-        
-        cursor.execute('''
-            UPDATE trades
-            SET exit_price = ?, pnl = ?, pnl_pct = ?, status = ?,
-                exit_reason = ?, exit_time = ?, duration_seconds = ?
-            WHERE id = ?
-        ''', (exit_price, pnl, pnl_pct, 'closed', exit_reason, exit_time, duration, trade_id))
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            exit_time = datetime.now().isoformat()
+            
+            # Get entry time to calculate duration
+            cursor.execute('SELECT entry_time FROM trades WHERE id = ?', (trade_id,))
+            result = cursor.fetchone()
+            
+            if result:
+                entry_time = datetime.fromisoformat(result[0])
+                exit_datetime = datetime.fromisoformat(exit_time)
+                duration = int((exit_datetime - entry_time).total_seconds())
+            else:
+                duration = None
+            
+            cursor.execute('''
+                UPDATE trades
+                SET exit_price = ?, pnl = ?, pnl_pct = ?, status = ?,
+                    exit_reason = ?, exit_time = ?, duration_seconds = ?
+                WHERE id = ?
+            ''', (exit_price, pnl, pnl_pct, 'closed', exit_reason, exit_time, duration, trade_id))
         
         logger.info(f"[DB] Trade closed: ID={trade_id}, PnL=${pnl:+.2f} ({pnl_pct:+.2f}%)")
     
@@ -248,18 +379,35 @@ class TradeLogger:
             message: Event message
             details: Additional details (JSON, text, etc.)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            timestamp = datetime.now().isoformat()
+            
+            cursor.execute('''
+                INSERT INTO events (timestamp, event_type, severity, message, details)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (timestamp, event_type, severity, message, details))
+    
+    def log_events(self, events: List[Dict]):
+        """
+        Log several system events in one statement
         
+        Args:
+            events: List of dicts with log_event() arguments
+                    (event_type, severity, message, optional details)
+        """
         timestamp = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO events (timestamp, event_type, severity, message, details)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (timestamp, event_type, severity, message, details))
-        
-        conn.commit()
-        conn.close()
+        rows = [
+            (timestamp, e['event_type'], e['severity'], e['message'], e.get('details'))
+            for e in events
+        ]
+        
+        with self._connection() as conn:
+            conn.executemany('''
+                INSERT INTO events (timestamp, event_type, severity, message, details)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
     
     def log_metrics(
         self,
@@ -291,25 +439,22 @@ class TradeLogger:
             avg_loss: Average losing trade
             sharpe_ratio: Sharpe ratio
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        timestamp = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO metrics (
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            timestamp = datetime.now().isoformat()
+            
+            cursor.execute('''
+                INSERT INTO metrics (
+                    timestamp, capital, peak_capital, drawdown, open_positions,
+                    total_exposure, daily_trades, total_pnl, win_rate, avg_win,
+                    avg_loss, sharpe_ratio
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
                 timestamp, capital, peak_capital, drawdown, open_positions,
                 total_exposure, daily_trades, total_pnl, win_rate, avg_win,
                 avg_loss, sharpe_ratio
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            timestamp, capital, peak_capital, drawdown, open_positions,
-            total_exposure, daily_trades, total_pnl, win_rate, avg_win,
-            avg_loss, sharpe_ratio
-        ))
-        
-        conn.commit()
-        conn.close()
+            ))
     
     def log_analysis(
         self,
@@ -339,23 +484,46 @@ class TradeLogger:
             reason: Decision reason
             rsi: RSI value
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        timestamp = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO analysis (
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            timestamp = datetime.now().isoformat()
+            
+            cursor.execute('''
+                INSERT INTO analysis (
+                    timestamp, symbol, price, atr, rsi, ml_signal, ml_confidence,
+                    sentiment_score, sentiment_label, decision, reason
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
                 timestamp, symbol, price, atr, rsi, ml_signal, ml_confidence,
                 sentiment_score, sentiment_label, decision, reason
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            timestamp, symbol, price, atr, rsi, ml_signal, ml_confidence,
-            sentiment_score, sentiment_label, decision, reason
-        ))
-        
-        conn.commit()
-        conn.close()
+            ))
+    
+    def log_analyses(self, analyses: List[Dict]):
+        """
+        Log several market analyses in one statement
+        
+        Args:
+            analyses: List of dicts with log_analysis() arguments
+                      (reason and rsi are optional)
+        """
+        timestamp = datetime.now().isoformat()
+        rows = [
+            (
+                timestamp, a['symbol'], a['price'], a['atr'], a.get('rsi'),
+                a['ml_signal'], a['ml_confidence'], a['sentiment_score'],
+                a['sentiment_label'], a['decision'], a.get('reason')
+            )
+            for a in analyses
+        ]
+        
+        with self._connection() as conn:
+            conn.executemany('''
+                INSERT INTO analysis (
+                    timestamp, symbol, price, atr, rsi, ml_signal, ml_confidence,
+                    sentiment_score, sentiment_label, decision, reason
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
     
     def get_trades(
         self,
@@ -374,24 +542,22 @@ class TradeLogger:
         Returns:
             DataFrame with trades
         """
-        conn = sqlite3.connect(self.db_path)
-        
-        query = "SELECT * FROM trades WHERE 1=1"
-        params = []
-        
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        
-        if symbol:
-            query += " AND symbol = ?"
-            params.append(symbol)
-        
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
-        
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        with self._connection() as conn:
+            query = "SELECT * FROM trades WHERE 1=1"
+            params = []
+            
+            if status:
+                query += " AND status = ?"
+                params.append(status)
+            
+            if symbol:
+                query += " AND symbol = ?"
+                params.append(symbol)
+            
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(limit)
+            
+            df = pd.read_sql_query(query, conn, params=params)
         
         return df
     
@@ -412,24 +578,22 @@ class TradeLogger:
         Returns:
             DataFrame with events
         """
-        conn = sqlite3.connect(self.db_path)
-        
-        query = "SELECT * FROM events WHERE 1=1"
-        params = []
-        
-        if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type)
-        
-        if severity:
-            query += " AND severity = ?"
-            params.append(severity)
-        
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
-        
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        with self._connection() as conn:
+            query = "SELECT * FROM events WHERE 1=1"
+            params = []
+            
+            if event_type:
+                query += " AND event_type = ?"
+                params.append(event_type)
+            
+            if severity:
+                query += " AND severity = ?"
+                params.append(severity)
+            
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(limit)
+            
+            df = pd.read_sql_query(query, conn, params=params)
         
         return df
     
@@ -440,49 +604,47 @@ class TradeLogger:
         Returns:
             Dictionary with performance metrics
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total trades
-        cursor.execute("SELECT COUNT(*) FROM trades WHERE status = 'closed'")
-        total_trades = cursor.fetchone()[0]
-        
-        # Winning trades
-        cursor.execute("SELECT COUNT(*) FROM trades WHERE status = 'closed' AND pnl > 0")
-        winning_trades = cursor.fetchone()[0]
-        
-        # Total PnL
-        cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed'")
-        result = cursor.fetchone()
-        total_pnl = result[0] if result[0] else 0
-        
-        # Average PnL
-        cursor.execute("SELECT AVG(pnl) FROM trades WHERE status = 'closed' AND pnl > 0")
-        result = cursor.fetchone()
-        avg_win = result[0] if result[0] else 0
-        
-        cursor.execute("SELECT AVG(pnl) FROM trades WHERE status = 'closed' AND pnl < 0")
-        result = cursor.fetchone()
-        avg_loss = result[0] if result[0] else 0
-        
-        # Max win/loss
-        cursor.execute("SELECT MAX(pnl) FROM trades WHERE status = 'closed'")
-        result = cursor.fetchone()
-        max_win = result[0] if result[0] else 0
-        
-        cursor.execute("SELECT MIN(pnl) FROM trades WHERE status = 'closed'")
-        result = cursor.fetchone()
-        max_loss = result[0] if result[0] else 0
-        
-        # Win rate
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        # Profit factor
-        total_wins = cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed' AND pnl > 0").fetchone()[0] or 0
-        total_losses = abs(cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed' AND pnl < 0").fetchone()[0] or 0)
-        profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
-        
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Total trades
+            cursor.execute("SELECT COUNT(*) FROM trades WHERE status = 'closed'")
+            total_trades = cursor.fetchone()[0]
+            
+            # Winning trades
+            cursor.execute("SELECT COUNT(*) FROM trades WHERE status = 'closed' AND pnl > 0")
+            winning_trades = cursor.fetchone()[0]
+            
+            # Total PnL
+            cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed'")
+            result = cursor.fetchone()
+            total_pnl = result[0] if result[0] else 0
+            
+            # Average PnL
+            cursor.execute("SELECT AVG(pnl) FROM trades WHERE status = 'closed' AND pnl > 0")
+            result = cursor.fetchone()
+            avg_win = result[0] if result[0] else 0
+            
+            cursor.execute("SELECT AVG(pnl) FROM trades WHERE status = 'closed' AND pnl < 0")
+            result = cursor.fetchone()
+            avg_loss = result[0] if result[0] else 0
+            
+            # Max win/loss
+            cursor.execute("SELECT MAX(pnl) FROM trades WHERE status = 'closed'")
+            result = cursor.fetchone()
+            max_win = result[0] if result[0] else 0
+            
+            cursor.execute("SELECT MIN(pnl) FROM trades WHERE status = 'closed'")
+            result = cursor.fetchone()
+            max_loss = result[0] if result[0] else 0
+            
+            # Win rate
+            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+            
+            # Profit factor
+            total_wins = cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed' AND pnl > 0").fetchone()[0] or 0
+            total_losses = abs(cursor.execute("SELECT SUM(pnl) FROM trades WHERE status = 'closed' AND pnl < 0").fetchone()[0] or 0)
+            profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
         
         return {
             'total_trades': total_trades,
@@ -505,11 +667,12 @@ class TradeLogger:
             table: Table name (trades, events, metrics, analysis)
             output_path: Output CSV file path
         """
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
-        conn.close()
+        with self._connection() as conn:
+            df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
         
-        df.to_csv(output_path, index=False)
+        # Large write buffer + chunked formatting keeps memory flat on big tables
+        with open(output_path, 'w', newline='', buffering=1 << 20) as fh:
+            df.to_csv(fh, index=False, chunksize=50_000)
         logger.info(f"[DB] Exported {table} to {output_path}")
     
     def clear_old_data(self, days: int = 90):
@@ -519,18 +682,16 @@ class TradeLogger:
         Args:
             days: Number of days to keep
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        from datetime import timedelta
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        cursor.execute("DELETE FROM events WHERE timestamp < ?", (cutoff_date,))
-        cursor.execute("DELETE FROM analysis WHERE timestamp < ?", (cutoff_date,))
-        cursor.execute("DELETE FROM metrics WHERE timestamp < ?", (cutoff_date,))
-        
-        conn.commit()
-        deleted_count = cursor.rowcount
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            from datetime import timedelta
+            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            
+            cursor.execute("DELETE FROM events WHERE timestamp < ?", (cutoff_date,))
+            cursor.execute("DELETE FROM analysis WHERE timestamp < ?", (cutoff_date,))
+            cursor.execute("DELETE FROM metrics WHERE timestamp < ?", (cutoff_date,))
+            
+            deleted_count = cursor.rowcount
         
         logger.info(f"[DB] Deleted {deleted_count} old records (older than {days} days)")
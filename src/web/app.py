@@ -5,7 +5,10 @@ Real-time web interface for monitoring trading bot
 """
 
 import logging
+from collections import deque
+from dataclasses import dataclass, asdict, is_dataclass
 from datetime import datetime
+from itertools import islice
 from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import threading
@@ -56,6 +59,24 @@ socketio = SocketIO(
     manage_session=False  # Don't manage sessions automatically
 )
 
+@dataclass(slots=True)
+class Trade:
+    """Closed trade shown on the dashboard (slotted to keep history compact)"""
+    symbol: str
+    side: str
+    entry_price: float
+    exit_price: float
+    pnl: float
+    pnl_pct: float
+    exit_time: str
+    exit_reason: str
+    quantity: float = 0.0
+    timestamp: str = ''
+
+
+# Ring buffer size for closed trades kept in memory (full history lives in TradeLogger)
+MAX_CLOSED_TRADES = 1000
+
 # Global bot state
 bot_state = {
     'status': 'stopped',  # stopped, running, paused
@@ -65,7 +86,7 @@ bot_state = {
     'total_pnl': 0.0,
     'total_pnl_pct': 0.0,
     'open_positions': [],
-    'closed_trades': [],
+    'closed_trades': deque(maxlen=MAX_CLOSED_TRADES),  # Trade records
     'total_trades': 0,
     'winning_trades': 0,
     'losing_trades': 0,
@@ -123,7 +144,7 @@ def initialize_trading_bot():
             api_key = os.getenv('BINANCE_API_KEY') or os.getenv('BYBIT_API_KEY')
             api_secret = os.getenv('BINANCE_API_SECRET') or os.getenv('BYBIT_API_SECRET')
         
-        logger.info(f'[BOT] Initializing trading bot (testnet={testnet_mode})...')
+        logger.info('[BOT] Initializing trading bot (testnet=%s)...', testnet_mode)
         
         trading_bot_instance = TradingExecutor(
             api_key=api_key,
@@ -137,7 +158,7 @@ def initialize_trading_bot():
         return trading_bot_instance
         
     except Exception as e:
-        logger.error(f'[BOT] Failed to initialize trading bot: {e}', exc_info=True)
+        logger.error('[BOT] Failed to initialize trading bot: %s', e, exc_info=True)
         return None
 
 
@@ -153,7 +174,7 @@ def api_status():
     try:
         return jsonify(get_serializable_bot_state())
     except Exception as e:
-        logger.error(f'Error serializing status: {e}', exc_info=True)
+        logger.error('Error serializing status: %s', e, exc_info=True)
         return jsonify({'error': str(e), 'status': 'error'}), 500
 
 
@@ -168,7 +189,7 @@ def api_config():
         market_manager = get_market_manager()
         market_info = market_manager.get_market_info()
     except Exception as e:
-        logger.error(f'Error getting market info: {e}')
+        logger.error('Error getting market info: %s', e)
         market_info = {'type': 'spot', 'is_spot': True, 'is_futures': False}
     
     return jsonify({
@@ -190,7 +211,7 @@ def api_trades():
     """Get trade history"""
     return jsonify({
         'open': bot_state['open_positions'],
-        'closed': bot_state['closed_trades'][-50:]  # Last 50 trades
+        'closed': make_serializable(get_recent_closed_trades(50))  # Last 50 trades
     })
 
 
@@ -262,27 +283,27 @@ def api_start():
                             try:
                                 update_bot_state_from_executor(result)
                             except Exception as state_error:
-                                logger.warning(f'[BOT] Could not update state: {state_error}')
+                                logger.warning('[BOT] Could not update state: %s', state_error)
                         
                         # Broadcast update to web clients
                         try:
                             broadcast_status_update()
                         except Exception as broadcast_error:
-                            logger.warning(f'[BOT] Could not broadcast update: {broadcast_error}')
+                            logger.warning('[BOT] Could not broadcast update: %s', broadcast_error)
                         
                     except Exception as e:
-                        logger.error(f'[BOT] Error in trading iteration: {e}', exc_info=True)
+                        logger.error('[BOT] Error in trading iteration: %s', e, exc_info=True)
                         try:
                             broadcast_log({'level': 'ERROR', 'message': f'Trading error: {str(e)}'})
                         except:
                             pass  # Don't fail if broadcast fails
                     
                     # Sleep until next iteration
-                    logger.info(f'[BOT] Waiting {interval}s until next iteration...')
+                    logger.info('[BOT] Waiting %ss until next iteration...', interval)
                     time.sleep(interval)
                     
             except Exception as e:
-                logger.error(f'[BOT] Fatal error in trading loop: {e}', exc_info=True)
+                logger.error('[BOT] Fatal error in trading loop: %s', e, exc_info=True)
                 bot_state['status'] = 'stopped'
                 broadcast_status_update()
             
@@ -301,7 +322,7 @@ def api_start():
         })
         
     except Exception as e:
-        logger.error(f'[BOT] Error starting bot: {e}', exc_info=True)
+        logger.error('[BOT] Error starting bot: %s', e, exc_info=True)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -343,7 +364,7 @@ def update_bot_state_from_executor(result):
                         'order_id': str(pos_data.get('order_id', ''))
                     })
             
-            logger.info(f'[BOT] State updated: {len(bot_state["open_positions"])} positions')
+            logger.info('[BOT] State updated: %s positions', len(bot_state["open_positions"]))
             
             # Update stats from trade logger
             if hasattr(trading_bot_instance, 'trade_logger'):
@@ -351,35 +372,35 @@ def update_bot_state_from_executor(result):
                     trades_df = trading_bot_instance.trade_logger.get_trades(limit=100)
                     # Check if DataFrame is not empty
                     if not trades_df.empty:
-                        # Convert DataFrame to list of dicts - БЕЗОПАСНО!
+                        # Convert DataFrame rows to Trade records - БЕЗОПАСНО!
                         valid_trades = []
                         for _, row in trades_df.iterrows():
-                            trade_dict = {
-                                'symbol': str(row.get('symbol', '')),
-                                'side': str(row.get('side', '')),
-                                'entry_price': float(row.get('entry_price', 0)),
-                                'exit_price': float(row.get('exit_price', 0)),
-                                'quantity': float(row.get('quantity', 0)),
-                                'pnl': float(row.get('pnl', 0)),
-                                'pnl_pct': float(row.get('pnl_pct', 0)),
-                                'timestamp': str(row.get('timestamp', '')),
-                                'exit_reason': str(row.get('exit_reason', ''))
-                            }
-                            valid_trades.append(trade_dict)
+                            valid_trades.append(Trade(
+                                symbol=str(row.get('symbol', '')),
+                                side=str(row.get('side', '')),
+                                entry_price=float(row.get('entry_price', 0)),
+                                exit_price=float(row.get('exit_price', 0)),
+                                pnl=float(row.get('pnl', 0)),
+                                pnl_pct=float(row.get('pnl_pct', 0)),
+                                exit_time=str(row.get('exit_time', '')),
+                                exit_reason=str(row.get('exit_reason', '')),
+                                quantity=float(row.get('quantity', 0)),
+                                timestamp=str(row.get('timestamp', ''))
+                            ))
                         
-                        bot_state['closed_trades'] = valid_trades[-50:]  # Last 50 trades
+                        bot_state['closed_trades'] = deque(valid_trades[-50:], maxlen=MAX_CLOSED_TRADES)  # Last 50 trades
                         bot_state['total_trades'] = len(valid_trades)
-                        bot_state['winning_trades'] = sum(1 for t in valid_trades if t.get('pnl', 0) > 0)
-                        bot_state['losing_trades'] = sum(1 for t in valid_trades if t.get('pnl', 0) < 0)
+                        bot_state['winning_trades'] = sum(1 for t in valid_trades if t.pnl > 0)
+                        bot_state['losing_trades'] = sum(1 for t in valid_trades if t.pnl < 0)
                         bot_state['win_rate'] = (bot_state['winning_trades'] / max(bot_state['total_trades'], 1)) * 100
                 except Exception as e:
-                    logger.warning(f'[BOT] Could not load trade history: {e}')
+                    logger.warning('[BOT] Could not load trade history: %s', e)
             
             bot_state['current_drawdown'] = float(getattr(rm, 'current_drawdown', 0.0))
             bot_state['max_drawdown'] = float(getattr(rm, 'max_drawdown', 0.0))
             
     except Exception as e:
-        logger.error(f'[BOT] Error updating state: {e}', exc_info=True)
+        logger.error('[BOT] Error updating state: %s', e, exc_info=True)
 
 
 @app.route('/api/control/stop', methods=['POST'])
@@ -546,7 +567,7 @@ def api_logs_history():
         })
         
     except Exception as e:
-        logger.error(f'Error reading log history: {e}', exc_info=True)
+        logger.error('Error reading log history: %s', e, exc_info=True)
         return jsonify({
             'logs': [],
             'error': str(e)
@@ -574,8 +595,10 @@ def make_serializable(obj):
         return float(obj) if isinstance(obj, float) else int(obj)
     elif isinstance(obj, dict):
         return {str(k): make_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
+    elif isinstance(obj, (list, tuple, deque)):
         return [make_serializable(item) for item in obj]
+    elif is_dataclass(obj) and not isinstance(obj, type):  # Trade records
+        return make_serializable(asdict(obj))
     elif hasattr(obj, 'isoformat'):  # datetime objects
         return obj.isoformat()
     elif hasattr(obj, 'tolist'):  # numpy arrays
@@ -585,6 +608,12 @@ def make_serializable(obj):
         return str(obj)
 
 
+def get_recent_closed_trades(limit=50):
+    """Get the most recent closed trades without copying the whole buffer"""
+    trades = bot_state['closed_trades']
+    return list(islice(trades, max(len(trades) - limit, 0), None))
+
+
 def get_serializable_bot_state():
     """Get bot state safe for JSON serialization"""
     try:
@@ -597,7 +626,7 @@ def get_serializable_bot_state():
             'total_pnl': float(bot_state.get('total_pnl', 0.0)),
             'total_pnl_pct': float(bot_state.get('total_pnl_pct', 0.0)),
             'open_positions': make_serializable(bot_state.get('open_positions', [])),
-            'closed_trades': make_serializable(bot_state.get('closed_trades', []))[:50],  # Last 50
+            'closed_trades': make_serializable(get_recent_closed_trades(50)),  # Last 50
             'total_trades': int(bot_state.get('total_trades', 0)),
             'winning_trades': int(bot_state.get('winning_trades', 0)),
             'losing_trades': int(bot_state.get('losing_trades', 0)),
@@ -608,7 +637,7 @@ def get_serializable_bot_state():
         }
         return safe_state
     except Exception as e:
-        logger.error(f'[WEB] Error serializing bot_state: {e}', exc_info=True)
+        logger.error('[WEB] Error serializing bot_state: %s', e, exc_info=True)
         # Return minimal safe state
         return {
             'status': 'stopped',
@@ -637,9 +666,9 @@ def handle_connect():
         if trading_bot_instance:
             try:
                 update_bot_state_from_executor(None)
-                logger.info(f'[WEB] Synced state on connect: {len(bot_state["open_positions"])} positions')
+                logger.info('[WEB] Synced state on connect: %s positions', len(bot_state["open_positions"]))
             except Exception as sync_err:
-                logger.warning(f'[WEB] Could not sync on connect: {sync_err}')
+                logger.warning('[WEB] Could not sync on connect: %s', sync_err)
     else:
         # No thread running
         if bot_state['status'] == 'running':
@@ -648,9 +677,9 @@ def handle_connect():
     try:
         safe_state = get_serializable_bot_state()
         emit('status_update', safe_state)
-        logger.info(f'[WEB] Sent state with {len(bot_state["open_positions"])} positions')
+        logger.info('[WEB] Sent state with %s positions', len(bot_state["open_positions"]))
     except Exception as e:
-        logger.error(f'[WEB] Failed to emit status_update on connect: {e}', exc_info=True)
+        logger.error('[WEB] Failed to emit status_update on connect: %s', e, exc_info=True)
         # Send minimal state
         emit('status_update', {'status': 'stopped', 'balance': 10000.0})
 
@@ -664,13 +693,13 @@ def handle_disconnect():
 @socketio.on_error()
 def error_handler(e):
     """Handle SocketIO errors"""
-    logger.warning(f'[WEB] SocketIO error: {e}')
+    logger.warning('[WEB] SocketIO error: %s', e)
 
 
 @socketio.on_error_default
 def default_error_handler(e):
     """Handle all other SocketIO errors"""
-    logger.warning(f'[WEB] SocketIO default error: {e}')
+    logger.warning('[WEB] SocketIO default error: %s', e)
 
 
 @socketio.on('request_update')
@@ -680,18 +709,18 @@ def handle_request_update():
         safe_state = get_serializable_bot_state()
         emit('status_update', safe_state)
     except Exception as e:
-        logger.error(f'[WEB] Failed to emit status_update on request: {e}')
+        logger.error('[WEB] Failed to emit status_update on request: %s', e)
 
 
 def broadcast_status_update():
     """Broadcast status update to all connected clients"""
     try:
         safe_state = get_serializable_bot_state()
-        logger.debug(f'[WEB] Broadcasting: {len(safe_state.get("open_positions", []))} positions, status={safe_state.get("status")}')
+        logger.debug('[WEB] Broadcasting: %s positions, status=%s', len(safe_state.get("open_positions", [])), safe_state.get("status"))
         socketio.emit('status_update', safe_state, namespace='/')
-        logger.debug(f'[WEB] Broadcast complete')
+        logger.debug('[WEB] Broadcast complete')
     except Exception as e:
-        logger.error(f'[WEB] Failed to broadcast status_update: {e}', exc_info=True)
+        logger.error('[WEB] Failed to broadcast status_update: %s', e, exc_info=True)
 
 
 def broadcast_trade_update(trade_data):
@@ -699,8 +728,8 @@ def broadcast_trade_update(trade_data):
     socketio.emit('trade_update', trade_data, namespace='/')
 
 
-def broadcast_log(log_data):
-    """Broadcast log message"""
+def broadcast_log(log_data, timestamp=None):
+    """Broadcast log message (timestamp: ISO string, defaults to now)"""
     # Determine category
     message = log_data.get('message', '')
     category = 'info'
@@ -715,7 +744,7 @@ def broadcast_log(log_data):
         category = 'error'
     
     bot_state['logs'].append({
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp or datetime.now().isoformat(),
         'level': log_data.get('level', 'INFO'),
         'message': message,
         'category': category
@@ -733,10 +762,11 @@ def update_bot_state(**kwargs):
     broadcast_status_update()
 
 
-def add_news_item(title, source, sentiment, category='neutral'):
-    """Add news item to feed"""
+def add_news_item(title, source, sentiment, category='neutral', timestamp=None):
+    """Add news item to feed (timestamp: ISO string, defaults to now)"""
+    timestamp = timestamp or datetime.now().isoformat()
     news_item = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp,
         'title': title,
         'source': source,
         'sentiment': sentiment,
@@ -756,13 +786,14 @@ def add_news_item(title, source, sentiment, category='neutral'):
     broadcast_log({
         'level': 'INFO',
         'message': f'📰 Новость: {title[:50]}... (sentiment: {sentiment:.2f} {sentiment_emoji})'
-    })
+    }, timestamp)
 
 
-def update_sentiment(sentiment_score):
-    """Update sentiment history"""
+def update_sentiment(sentiment_score, timestamp=None):
+    """Update sentiment history (timestamp: ISO string, defaults to now)"""
+    timestamp = timestamp or datetime.now().isoformat()
     sentiment_item = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp,
         'score': sentiment_score
     }
     bot_state['sentiment_history'].append(sentiment_item)
@@ -775,7 +806,7 @@ def update_sentiment(sentiment_score):
     broadcast_log({
         'level': 'INFO',
         'message': f'📊 Sentiment обновлен: {sentiment_score:.2f} ({get_sentiment_label(sentiment_score)})'
-    })
+    }, timestamp)
 
 
 def get_sentiment_label(score):
@@ -811,14 +842,14 @@ def start_news_scheduler():
         )
         
         news_scheduler.start()
-        logger.info(f'[NEWS] ✅ Scheduler started: {interval} minute interval')
+        logger.info('[NEWS] ✅ Scheduler started: %s minute interval', interval)
         broadcast_log({
             'level': 'INFO',
             'message': f'📰 News scheduler started (updates every {interval} minutes)'
         })
         
     except Exception as e:
-        logger.error(f'[NEWS] ❌ Failed to start scheduler: {e}', exc_info=True)
+        logger.error('[NEWS] ❌ Failed to start scheduler: %s', e, exc_info=True)
         broadcast_log({
             'level': 'ERROR',
             'message': f'❌ Failed to start news scheduler: {e}'
@@ -840,15 +871,15 @@ def on_news_update(data):
         # Update sentiment history
         update_sentiment(data['avg_sentiment'])
         
-        logger.info(f'[NEWS] ✅ Updated {len(data["news"])} news items')
+        logger.info('[NEWS] ✅ Updated %s news items', len(data["news"]))
         
     except Exception as e:
-        logger.error(f'[NEWS] ❌ Error processing news update: {e}', exc_info=True)
+        logger.error('[NEWS] ❌ Error processing news update: %s', e, exc_info=True)
 
 
 def run_web_server(host='127.0.0.1', port=5000, debug=False):
     """Run Flask web server"""
-    logger.info(f'[WEB] Starting web dashboard on http://{host}:{port}')
+    logger.info('[WEB] Starting web dashboard on http://%s:%s', host, port)
     socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
 
 
@@ -860,7 +891,7 @@ def start_web_server_thread(host='127.0.0.1', port=5000):
         daemon=True
     )
     thread.start()
-    logger.info(f'[WEB] Dashboard started at http://{host}:{port}')
+    logger.info('[WEB] Dashboard started at http://%s:%s', host, port)
     return thread
 
 
@@ -888,6 +919,13 @@ def start_demo_updates():
         
         while True:
             if bot_state['status'] == 'running':
+                # One timestamp for everything logged in this iteration
+                ts_iso = datetime.now().isoformat()
+                
+                # Bind shared lists once per iteration
+                positions = bot_state['open_positions']
+                n_positions = len(positions)
+                
                 # Simulate balance changes
                 change = random.uniform(-50, 100)
                 bot_state['balance'] = max(5000, bot_state['balance'] + change)
@@ -901,12 +939,16 @@ def start_demo_updates():
                     sentiment = random.uniform(-0.8, 0.9)
                     category = 'positive' if sentiment > 0.2 else 'negative' if sentiment < -0.2 else 'neutral'
                     
-                    add_news_item(title, source, sentiment, category)
+                    add_news_item(title, source, sentiment, category, ts_iso)
+                    
+                    # add_news_item() may have trimmed the feed into a new list
+                    news_list = bot_state['news']
+                    n_news = len(news_list)
                     
                     # Update average sentiment every few news items
-                    if len(bot_state['news']) > 0:
-                        avg_sentiment = sum(n['sentiment'] for n in bot_state['news'][-10:]) / min(10, len(bot_state['news']))
-                        update_sentiment(avg_sentiment)
+                    if n_news > 0:
+                        avg_sentiment = sum(n['sentiment'] for n in news_list[-10:]) / min(10, n_news)
+                        update_sentiment(avg_sentiment, ts_iso)
                 
                 news_counter += 1
                 
@@ -921,43 +963,44 @@ def start_demo_updates():
                         ('WARNING', '⚠️ Низкая волатильность рынка'),
                     ]
                     level, msg = random.choice(messages)
-                    broadcast_log({'level': level, 'message': msg})
+                    broadcast_log({'level': level, 'message': msg}, ts_iso)
                 
                 # Simulate trades
-                if random.random() < 0.05 and len(bot_state['open_positions']) < 2:
+                if random.random() < 0.05 and n_positions < 2:
                     side = random.choice(['long', 'short'])
                     price = random.uniform(94000, 96000)
-                    bot_state['open_positions'].append({
+                    positions.append({
                         'symbol': 'BTC/USDT',
                         'side': side,
                         'entry_price': price,
                         'current_price': price,
                         'pnl': 0,
                         'pnl_pct': 0,
-                        'entry_time': datetime.now().isoformat()
+                        'entry_time': ts_iso
                     })
-                    broadcast_log({'level': 'SUCCESS', 'message': f'🎯 Opened {side.upper()} @ ${price:.2f}'})
+                    n_positions += 1
+                    broadcast_log({'level': 'SUCCESS', 'message': f'🎯 Opened {side.upper()} @ ${price:.2f}'}, ts_iso)
                 
                 # Update open positions
-                for pos in bot_state['open_positions']:
+                for pos in positions:
                     pos['current_price'] += random.uniform(-100, 100)
                     multiplier = 1 if pos['side'] == 'long' else -1
                     pos['pnl'] = (pos['current_price'] - pos['entry_price']) * 0.01 * multiplier
                     pos['pnl_pct'] = ((pos['current_price'] - pos['entry_price']) / pos['entry_price']) * 100 * multiplier
                 
                 # Close positions randomly
-                if bot_state['open_positions'] and random.random() < 0.03:
-                    pos = bot_state['open_positions'].pop(0)
-                    trade = {
-                        'symbol': pos['symbol'],
-                        'side': pos['side'],
-                        'entry_price': pos['entry_price'],
-                        'exit_price': pos['current_price'],
-                        'pnl': pos['pnl'],
-                        'pnl_pct': pos['pnl_pct'],
-                        'exit_time': datetime.now().isoformat(),
-                        'exit_reason': random.choice(['take_profit', 'stop_loss', 'trailing_stop'])
-                    }
+                if n_positions and random.random() < 0.03:
+                    pos = positions.pop(0)
+                    trade = Trade(
+                        symbol=pos['symbol'],
+                        side=pos['side'],
+                        entry_price=pos['entry_price'],
+                        exit_price=pos['current_price'],
+                        pnl=pos['pnl'],
+                        pnl_pct=pos['pnl_pct'],
+                        exit_time=ts_iso,
+                        exit_reason=random.choice(['take_profit', 'stop_loss', 'trailing_stop'])
+                    )
                     bot_state['closed_trades'].append(trade)
                     bot_state['total_trades'] += 1
                     if pos['pnl'] > 0:
@@ -968,14 +1011,14 @@ def start_demo_updates():
                     
                     result = '✅ Profit' if pos['pnl'] > 0 else '❌ Loss'
                     broadcast_log({'level': 'SUCCESS' if pos['pnl'] > 0 else 'ERROR', 
-                                  'message': f'{result}: Closed {pos["side"].upper()} @ ${pos["current_price"]:.2f} | P&L: ${pos["pnl"]:.2f}'})
+                                  'message': f'{result}: Closed {pos["side"].upper()} @ ${pos["current_price"]:.2f} | P&L: ${pos["pnl"]:.2f}'}, ts_iso)
                 
                 broadcast_status_update()
             
-            time.sleep(2)  # Update every 2 seconds
+            socketio.sleep(2)  # Update every 2 seconds
     
-    demo_thread = threading.Thread(target=update_demo_data, daemon=True)
-    demo_thread.start()
+    # Let SocketIO schedule the task for its async mode (thread or greenlet)
+    socketio.start_background_task(update_demo_data)
     logger.info('[WEB] Demo mode enabled - generating test data')
 
 
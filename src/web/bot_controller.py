@@ -6,7 +6,6 @@ Controls trading bot execution and provides interface for web dashboard
 
 import logging
 import threading
-import time
 from datetime import datetime
 from typing import Optional
 
@@ -29,6 +28,7 @@ class BotController:
         self.running = False
         self.paused = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
         
         logger.info('[CONTROLLER] Bot controller initialized')
     
@@ -40,6 +40,7 @@ class BotController:
         
         self.running = True
         self.paused = False
+        self._stop_event.clear()
         
         # Start bot in separate thread
         self.thread = threading.Thread(target=self._run_bot, daemon=True)
@@ -55,6 +56,7 @@ class BotController:
         
         self.running = False
         self.paused = False
+        self._stop_event.set()  # Wake the loop instead of waiting out its sleep
         
         # Wait for thread to finish
         if self.thread and self.thread.is_alive():
@@ -81,7 +83,13 @@ class BotController:
         logger.info('[CONTROLLER] Bot resumed')
     
     def _run_bot(self):
-        """Internal method to run bot loop"""
+        """
+        Internal method to run bot loop
+        
+        run_iteration() holds the GIL for as long as it runs pure Python code,
+        so it should push numerical work through NumPy/pandas (which release
+        the GIL) to keep the web server responsive.
+        """
         logger.info('[CONTROLLER] Bot loop started')
         
         try:
@@ -90,11 +98,11 @@ class BotController:
                     # Run bot iteration
                     self.bot.run_iteration()
                 
-                # Sleep between iterations
-                time.sleep(5)  # Check every 5 seconds
+                # Sleep between iterations, returning early on stop()
+                self._stop_event.wait(5)  # Check every 5 seconds
         
         except Exception as e:
-            logger.error(f'[CONTROLLER] Bot loop error: {e}', exc_info=True)
+            logger.error('[CONTROLLER] Bot loop error: %s', e, exc_info=True)
             self.running = False
         
         logger.info('[CONTROLLER] Bot loop stopped')
@@ -5,21 +5,10 @@ Tests the complete trading execution system in DRY RUN mode.
 """
 
 import sys
-from pathlib import Path
 import logging
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.trading.executor import TradingExecutor
-
-
-def setup_logging():
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+from src.utils.script_logging import setup_logging
 
 
 def test_executor():
@@ -171,7 +160,7 @@ def main():
         print("[WARNING] NEVER use mainnet without thorough testing!")
         
     except Exception as e:
-        logging.error(f"[ERROR] Test failed: {e}")
+        logging.error("[ERROR] Test failed: %s", e)
         import traceback
         traceback.print_exc()
         return 1
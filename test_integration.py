@@ -5,25 +5,13 @@ Tests the complete trading signal generation pipeline.
 """
 
 import sys
-from pathlib import Path
 import logging
-import pandas as pd
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.market_data import MarketDataFetcher
 from src.ml.predictor import MLPredictor
 from src.sentiment.news_analyzer import NewsAnalyzer
 from src.risk.risk_manager import RiskManager
-
-
-def setup_logging():
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+from src.utils.script_logging import setup_logging
 
 
 def test_complete_pipeline():
@@ -60,8 +48,8 @@ def test_complete_pipeline():
     print("="*80 + "\n")
     
     predictor = MLPredictor()
-    df_clean = df.loc[:, ~df.columns.duplicated()]
-    X, y, features = predictor.prepare_data(df_clean)
+    # prepare_features() already returns unique columns
+    X, y, features = predictor.prepare_data(df)
     
     print(f"[INFO] Training on {len(X)} samples...")
     metrics = predictor.train(X, y, validation_split=0.2)
@@ -69,8 +57,6 @@ def test_complete_pipeline():
     
     # Get prediction for latest data
     last_row = X.iloc[-1]
-    if isinstance(last_row, pd.Series) and last_row.index.duplicated().any():
-        last_row = last_row[~last_row.index.duplicated(keep='first')]
     
     ml_prediction, ml_confidence = predictor.predict_single(last_row)
     ml_signal = "UP" if ml_prediction == 1 else "DOWN"
@@ -261,7 +247,7 @@ def main():
         print("   4. Deploy to VPS with real testnet trading")
         
     except Exception as e:
-        logging.error(f"[ERROR] Integration test failed: {e}")
+        logging.error("[ERROR] Integration test failed: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -4,24 +4,18 @@ Sentiment Analysis Test Script
 Tests the news fetching and sentiment analysis functionality.
 """
 
+import os
 import sys
-from pathlib import Path
 import logging
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 from src.sentiment.news_analyzer import NewsAnalyzer
+from src.utils.script_logging import setup_logging
 
 
-def setup_logging():
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-
-
+# Live news fetching makes real HTTP calls: reported as skipped unless enabled
+@unittest.skipUnless(os.getenv('RUN_NETWORK_TESTS'), "Set RUN_NETWORK_TESTS=1 to fetch live news")
 def test_sentiment_analysis():
     """Test sentiment analysis for various symbols"""
     print("\n" + "="*80)
@@ -33,13 +27,20 @@ def test_sentiment_analysis():
     # Test symbols
     symbols = ['BTC', 'ETH']
     
+    # Fetch all symbols concurrently (HTTP-bound), report in order below
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = {
+            symbol: pool.submit(analyzer.get_sentiment, symbol, hours_back=24)
+            for symbol in symbols
+        }
+    
     for symbol in symbols:
         print(f"\n[TESTING] Analyzing sentiment for {symbol}...")
         print("-" * 80)
         
         try:
             # Get sentiment
-            sentiment = analyzer.get_sentiment(symbol, hours_back=24)
+            sentiment = futures[symbol].result()
             
             print(f"[RESULT] Sentiment Analysis for {symbol}:")
             print(f"  Score:      {sentiment['score']:.4f} (-1 to 1)")
@@ -127,7 +128,10 @@ def main():
         print("[INFO]   - NEWSAPI_KEY from https://newsapi.org/register")
         print("-" * 80 + "\n")
         
-        test_sentiment_analysis()
+        try:
+            test_sentiment_analysis()
+        except unittest.SkipTest as skip:
+            print(f"[SKIP] {skip}")
         
         print("\n" + "="*80)
         print("   ALL TESTS COMPLETED!")
@@ -140,7 +144,7 @@ def main():
         print("   4. (Phase 2) Migrate to FinBERT for better accuracy")
         
     except Exception as e:
-        logging.error(f"[ERROR] Test failed: {e}")
+        logging.error("[ERROR] Test failed: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -4,27 +4,22 @@ Main Test Script
 Tests the data fetching and ML prediction pipeline.
 """
 
-import sys
-from pathlib import Path
+from functools import lru_cache
 import logging
 import pandas as pd
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.data.market_data import MarketDataFetcher
 from src.ml.predictor import MLPredictor
+from src.utils.script_logging import setup_logging
 
 
-def setup_logging():
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('logs/test_run.log')
-        ]
+@lru_cache(maxsize=4)
+def load_market_data(symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+    """Fetch market data once per (symbol, timeframe, limit) in this process"""
+    return MarketDataFetcher().get_market_data(
+        symbol=symbol,
+        timeframe=timeframe,
+        limit=limit
     )
 
 
@@ -34,15 +29,8 @@ def test_data_pipeline():
     print("[DATA] TESTING DATA PIPELINE")
     print("="*80 + "\n")
     
-    # Initialize fetcher
-    fetcher = MarketDataFetcher()
-    
-    # Fetch data
-    df = fetcher.get_market_data(
-        symbol='BTC/USDT',
-        timeframe='15m',
-        limit=1000
-    )
+    # Fetch data (cached, so later tests reuse the same frame)
+    df = load_market_data('BTC/USDT', '15m', 1000)
     
     print(f"\n[SUCCESS] Successfully fetched {len(df)} rows")
     print(f"[INFO] Columns: {list(df.columns)}")
@@ -59,7 +47,8 @@ def test_ml_pipeline(df):
     print("="*80 + "\n")
     
     # Remove duplicate columns before ML pipeline
-    df = df.loc[:, ~df.columns.duplicated()]
+    if df.columns.has_duplicates:
+        df = df.loc[:, ~df.columns.duplicated()]
     
     # Initialize predictor
     predictor = MLPredictor()
@@ -83,7 +72,7 @@ def test_ml_pipeline(df):
     print("\n[ML] Testing prediction on latest data...")
     last_row = X.iloc[-1]
     # Remove duplicate indices if any
-    if isinstance(last_row, pd.Series) and last_row.index.duplicated().any():
+    if isinstance(last_row, pd.Series) and last_row.index.has_duplicates:
         last_row = last_row[~last_row.index.duplicated(keep='first')]
     
     prediction, confidence = predictor.predict_single(last_row)
@@ -109,7 +98,8 @@ def test_walk_forward_validation(df):
         df,
         train_days=30,  # Smaller for testing
         test_days=10,
-        step_days=5
+        step_days=5,
+        max_folds=2  # Smoke test, each fold retrains the model
     )
     
     print(f"\n[SUCCESS] Completed {len(results)} validation folds")
@@ -119,7 +109,7 @@ def test_walk_forward_validation(df):
 
 def main():
     """Main test function"""
-    setup_logging()
+    setup_logging(log_file='logs/test_run.log')
     
     print("\n" + "="*80)
     print("   AI CRYPTO BOT - SYSTEM TEST")
@@ -147,7 +137,7 @@ def main():
         print("   4. Proceed to implement Sentiment and Risk modules")
         
     except Exception as e:
-        logging.error(f"[ERROR] Test failed: {e}", exc_info=True)
+        logging.error("[ERROR] Test failed: %s", e, exc_info=True)
         raise
 
 
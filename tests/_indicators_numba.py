@@ -0,0 +1,191 @@
+"""
+Индикаторы на чистом NumPy-цикле для тестов, ускоренные через numba (если установлена)
+"""
+import numpy as np
+
+# numba опциональна: без неё функции работают как обычный Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Заглушка декоратора numba.njit (возвращает функцию без изменений)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _rsi_wilder(close, n):
+    """
+    RSI со сглаживанием Уайлдера за один проход
+    
+    Первые n значений NaN; дальше средние gain/loss обновляются
+    как (prev * (n - 1) + current) / n.
+    """
+    out = np.full(close.shape[0], np.nan)
+    gain = 0.0
+    loss = 0.0
+    
+    for i in range(1, close.shape[0]):
+        d = close[i] - close[i - 1]
+        g = d if d > 0 else 0.0
+        l = -d if d < 0 else 0.0
+        
+        if i <= n:
+            # Накопление начального окна (простое среднее)
+            gain += g
+            loss += l
+            if i < n:
+                continue
+            gain /= n
+            loss /= n
+        else:
+            gain = (gain * (n - 1) + g) / n
+            loss = (loss * (n - 1) + l) / n
+        
+        out[i] = 100.0 if loss == 0.0 else 100.0 - 100.0 / (1.0 + gain / loss)
+    
+    return out
+
+
+@njit(cache=True)
+def _bollinger_bands(close, n=20, k=2.0):
+    """
+    Полосы Боллинджера за один проход по скользящим суммам x и x^2
+    
+    Суммы ведутся с компенсацией Кэхэна; std по генеральной совокупности
+    (ddof=0, как в pandas_ta.bbands). Возвращает (lower, upper), первые n-1 значений NaN.
+    """
+    size = close.shape[0]
+    lower = np.full(size, np.nan)
+    upper = np.full(size, np.nan)
+    s = 0.0
+    s2 = 0.0
+    c = 0.0
+    c2 = 0.0
+    
+    for i in range(size):
+        dx = close[i]
+        dx2 = dx * dx
+        if i >= n:
+            # Окно сдвинулось: убираем выпавшее значение
+            old = close[i - n]
+            dx -= old
+            dx2 -= old * old
+        
+        y = dx - c
+        t = s + y
+        c = (t - s) - y
+        s = t
+        
+        y = dx2 - c2
+        t = s2 + y
+        c2 = (t - s2) - y
+        s2 = t
+        
+        if i >= n - 1:
+            mean = s / n
+            var = s2 / n - mean * mean
+            std = np.sqrt(var) if var > 0.0 else 0.0
+            lower[i] = mean - k * std
+            upper[i] = mean + k * std
+    
+    return lower, upper
+
+
+@njit(cache=True)
+def _atr(high, low, close, n):
+    """
+    ATR со сглаживанием Уайлдера (alpha = 1/n) за один проход
+    
+    True range первого бара равен high - low; сглаживание начинается с него
+    (как ewm(alpha=1/n, adjust=False) в pandas).
+    """
+    size = close.shape[0]
+    out = np.empty(size)
+    if size == 0:
+        return out
+    
+    alpha = 1.0 / n
+    prev = high[0] - low[0]
+    out[0] = prev
+    
+    for i in range(1, size):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        prev = (1.0 - alpha) * prev + alpha * tr
+        out[i] = prev
+    
+    return out
+
+
+# Как часто скользящие суммы SMA пересчитываются заново (ограничивает накопление ошибки)
+_SMA_REANCHOR = 1024
+
+
+@njit(cache=True)
+def _window_sum(x, end, n):
+    """Точная сумма окна x[end - n + 1 : end + 1]"""
+    s = 0.0
+    for j in range(end - n + 1, end + 1):
+        s += x[j]
+    return s
+
+
+@njit(cache=True)
+def _fused_indicators(high, low, close):
+    """
+    SMA-20/50, EMA-12/26 и ATR-14 за один последовательный проход
+    
+    Возвращает матрицу (n, 5) со столбцами [sma_20, sma_50, ema_12, ema_26, atr].
+    SMA ведутся скользящими суммами (O(1) на бар); каждые _SMA_REANCHOR баров
+    сумма окна пересчитывается заново, чтобы ошибка округления не копилась
+    на длинных рядах.
+    """
+    size = close.shape[0]
+    out = np.full((size, 5), np.nan)
+    if size == 0:
+        return out
+    
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a_atr = 1.0 / 14.0
+    ema12 = close[0]
+    ema26 = close[0]
+    atr = high[0] - low[0]
+    s20 = close[0]
+    s50 = close[0]
+    out[0, 2] = ema12
+    out[0, 3] = ema26
+    out[0, 4] = atr
+    
+    for i in range(1, size):
+        c = close[i]
+        
+        # Скользящие суммы окон 20 и 50 с периодическим пересчётом
+        if i % _SMA_REANCHOR == 0:
+            s20 = _window_sum(close, i, min(i + 1, 20))
+            s50 = _window_sum(close, i, min(i + 1, 50))
+        else:
+            s20 += c
+            s50 += c
+            if i >= 20:
+                s20 -= close[i - 20]
+            if i >= 50:
+                s50 -= close[i - 50]
+        if i >= 19:
+            out[i, 0] = s20 / 20.0
+        if i >= 49:
+            out[i, 1] = s50 / 50.0
+        
+        ema12 = (1.0 - a12) * ema12 + a12 * c
+        ema26 = (1.0 - a26) * ema26 + a26 * c
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        atr = (1.0 - a_atr) * atr + a_atr * tr
+        out[i, 2] = ema12
+        out[i, 3] = ema26
+        out[i, 4] = atr
+    
+    return out
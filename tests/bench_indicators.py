@@ -0,0 +1,67 @@
+"""
+Бенчмарк fused-ядра индикаторов (numba) против pandas
+
+Запуск: python -m tests.bench_indicators [n_bars]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from tests._indicators_numba import NUMBA_AVAILABLE, _fused_indicators
+
+
+def _reference(high, low, close):
+    """Те же индикаторы через pandas (rolling / ewm)"""
+    h, l, c = pd.Series(high), pd.Series(low), pd.Series(close)
+    prev_close = c.shift(1)
+    true_range = pd.concat(
+        [h - l, (h - prev_close).abs(), (l - prev_close).abs()], axis=1
+    ).max(axis=1)
+    return np.column_stack([
+        c.rolling(20).mean(),
+        c.rolling(50).mean(),
+        c.ewm(span=12, adjust=False).mean(),
+        c.ewm(span=26, adjust=False).mean(),
+        true_range.ewm(alpha=1 / 14, adjust=False).mean(),
+    ])
+
+
+def _best_of(func, *args, repeat=5):
+    """Минимальное время выполнения из repeat запусков (секунды)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_bars=100_000):
+    rng = np.random.default_rng(42)
+    close = 40000 * np.exp(np.cumsum(rng.standard_normal(n_bars) * 0.002))
+    high = close * (1 + rng.uniform(0, 0.005, n_bars))
+    low = close * (1 - rng.uniform(0, 0.005, n_bars))
+    
+    # Без numba ядро исполняется как чистый Python, и сравнение времени бессмысленно
+    if not NUMBA_AVAILABLE:
+        print(f"[SKIP] numba не установлена: бенчмарк fused-ядра пропущен (баров: {n_bars:,})")
+        return
+    
+    # Прогрев (компиляция numba)
+    fused = _fused_indicators(high, low, close)
+    expected = _reference(high, low, close)
+    
+    assert np.allclose(fused, expected, rtol=1e-12, equal_nan=True), "Результаты расходятся с pandas"
+    
+    t_fused = _best_of(_fused_indicators, high, low, close)
+    t_pandas = _best_of(_reference, high, low, close)
+    
+    print(f"Баров: {n_bars:,}")
+    print(f"  pandas: {t_pandas * 1000:8.2f} мс")
+    print(f"  fused:  {t_fused * 1000:8.2f} мс  ({t_pandas / t_fused:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,13 @@
+"""
+Общая настройка pytest: корень проекта в sys.path для импорта src.*
+
+Тестовые классы не делят изменяемое состояние между собой (общие данные
+строятся в setUpClass и только читаются), поэтому поддерживается
+параллельный запуск через pytest-xdist: python -m pytest tests/ -n auto
+"""
+import sys
+from pathlib import Path
+
+_root_dir = str(Path(__file__).resolve().parent.parent)
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
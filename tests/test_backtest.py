@@ -2,13 +2,10 @@
 Unit тесты для модуля backtest.py
 """
 import unittest
-from unittest.mock import Mock, patch
+from functools import lru_cache
+from unittest.mock import Mock
 import pandas as pd
 import numpy as np
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.backtesting.backtest import Backtester
 
@@ -43,37 +40,60 @@ class TestBacktester(unittest.TestCase):
         }
         self.backtester = Backtester(self.config)
     
+    @staticmethod
+    def _make_position(side, entry_price, quantity):
+        """Позиция в формате Backtester (position_size - объём в USDT на входе)"""
+        return {
+            'side': side,
+            'entry_price': entry_price,
+            'quantity': quantity,
+            'position_size': entry_price * quantity
+        }
+    
     def _create_sample_data(self, n_samples=500):
-        """Создание тестовых данных для бэктеста"""
-        np.random.seed(42)
-        dates = pd.date_range(start='2024-01-01', periods=n_samples, freq='1h')
+        """Тестовые данные для бэктеста (поверхностная копия из кэша)"""
+        return self._build_sample_data(n_samples).copy(deep=False)
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _build_sample_data(n_samples):
+        """Создание тестовых данных для бэктеста (seed фиксирован, кэшируется по n_samples)"""
+        rng = np.random.default_rng(42)
+        
+        # Один блок нормальных шумов вместо отдельного массива на каждую колонку:
+        # [шаг цены, open, high, low, sma_20, sma_50, ema_12, ema_26, macd, macd_signal, macd_hist]
+        noise = rng.standard_normal((n_samples, 11))
+        noise *= [100, 50, 100, 100, 20, 30, 15, 25, 10, 8, 5]
+        np.abs(noise[:, 2:4], out=noise[:, 2:4])
         
         # Генерируем цены с трендом
-        close_prices = 40000 + np.cumsum(np.random.randn(n_samples) * 100)
-        
-        data = {
-            'timestamp': dates,
-            'open': close_prices + np.random.randn(n_samples) * 50,
-            'high': close_prices + np.abs(np.random.randn(n_samples) * 100),
-            'low': close_prices - np.abs(np.random.randn(n_samples) * 100),
-            'close': close_prices,
-            'volume': np.random.uniform(100, 1000, n_samples),
-            'sma_20': close_prices + np.random.randn(n_samples) * 20,
-            'sma_50': close_prices + np.random.randn(n_samples) * 30,
-            'ema_12': close_prices + np.random.randn(n_samples) * 15,
-            'ema_26': close_prices + np.random.randn(n_samples) * 25,
-            'rsi': np.random.uniform(30, 70, n_samples),
-            'macd': np.random.randn(n_samples) * 10,
-            'macd_signal': np.random.randn(n_samples) * 8,
-            'macd_hist': np.random.randn(n_samples) * 5,
-            'bb_upper': close_prices + 500,
-            'bb_middle': close_prices,
-            'bb_lower': close_prices - 500,
-            'atr': np.random.uniform(200, 600, n_samples),
-            'target': np.random.choice([-1, 0, 1], n_samples)
-        }
+        close_prices = 40000 + np.cumsum(noise[:, 0])
+        
+        # Цены и индикаторы строятся поверх close на месте
+        noise[:, 1:8] += close_prices[:, None]
+        noise[:, 3] = 2 * close_prices - noise[:, 3]  # low = close - |шум|
+        noise[:, 0] = close_prices
+        
+        df = pd.DataFrame(
+            noise,
+            columns=[
+                'close', 'open', 'high', 'low', 'sma_20', 'sma_50', 'ema_12',
+                'ema_26', 'macd', 'macd_signal', 'macd_hist'
+            ]
+        )
         
-        return pd.DataFrame(data)
+        # Равномерные колонки одним вызовом: volume, rsi, atr
+        uniform = rng.uniform([100, 30, 200], [1000, 70, 600], size=(n_samples, 3))
+        df['volume'] = uniform[:, 0]
+        df['rsi'] = uniform[:, 1]
+        df['atr'] = uniform[:, 2]
+        df['bb_upper'] = close_prices + 500
+        df['bb_middle'] = close_prices
+        df['bb_lower'] = close_prices - 500
+        df['target'] = rng.choice([-1, 0, 1], n_samples)
+        df.insert(0, 'timestamp', pd.date_range(start='2024-01-01', periods=n_samples, freq='1h'))
+        
+        return df
     
     def test_initialization(self):
         """Тест инициализации класса"""
@@ -83,62 +103,41 @@ class TestBacktester(unittest.TestCase):
         self.assertEqual(len(self.backtester.trades), 0)
     
     def test_calculate_trade_cost(self):
-        """Тест расчёта стоимости сделки (комиссия + проскальзывание)"""
+        """Тест расчёта стоимости сделки (комиссия за вход и выход)"""
         price = 40000
-        size = 0.025
+        quantity = 0.025
+        position = self._make_position('long', price, quantity)
         
-        cost = self.backtester.calculate_trade_cost(price, size)
+        # Выход по цене входа: весь PnL - это стоимость сделки
+        cost = -self.backtester._calculate_pnl(position, price)
         
-        # Стоимость = цена * размер * (комиссия + проскальзывание)
-        expected = price * size * (self.config['backtesting']['commission'] + 
-                                   self.config['backtesting']['slippage'])
+        # Стоимость = размер позиции * комиссия * 2 (вход + выход)
+        expected = position['position_size'] * self.backtester.commission * 2
         
         self.assertAlmostEqual(cost, expected, places=2)
     
-    def test_execute_trade_long(self):
-        """Тест исполнения long сделки"""
-        entry_price = 40000
-        exit_price = 41000
+    def test_execute_trade(self):
+        """Тест исполнения сделок: long/short, прибыль/убыток"""
         size = 0.025
+        cases = [
+            # (сторона, вход, выход, знак PnL)
+            ('long', 40000, 41000, 1),
+            ('short', 40000, 39000, 1),
+            ('long', 40000, 39000, -1),  # Цена упала
+        ]
         
-        pnl = self.backtester.execute_trade('long', entry_price, exit_price, size)
-        
-        # PnL = (exit - entry) * size - costs
-        gross_pnl = (exit_price - entry_price) * size
-        entry_cost = self.backtester.calculate_trade_cost(entry_price, size)
-        exit_cost = self.backtester.calculate_trade_cost(exit_price, size)
-        expected_pnl = gross_pnl - entry_cost - exit_cost
-        
-        self.assertAlmostEqual(pnl, expected_pnl, places=2)
-        self.assertGreater(pnl, 0)  # Прибыльная сделка
-    
-    def test_execute_trade_short(self):
-        """Тест исполнения short сделки"""
-        entry_price = 40000
-        exit_price = 39000
-        size = 0.025
-        
-        pnl = self.backtester.execute_trade('short', entry_price, exit_price, size)
-        
-        # PnL для short = (entry - exit) * size - costs
-        gross_pnl = (entry_price - exit_price) * size
-        expected_pnl = gross_pnl - (
-            self.backtester.calculate_trade_cost(entry_price, size) +
-            self.backtester.calculate_trade_cost(exit_price, size)
-        )
-        
-        self.assertAlmostEqual(pnl, expected_pnl, places=2)
-        self.assertGreater(pnl, 0)  # Прибыльная сделка
-    
-    def test_execute_trade_long_loss(self):
-        """Тест убыточной long сделки"""
-        entry_price = 40000
-        exit_price = 39000  # Цена упала
-        size = 0.025
-        
-        pnl = self.backtester.execute_trade('long', entry_price, exit_price, size)
-        
-        self.assertLess(pnl, 0)  # Убыточная сделка
+        for side, entry_price, exit_price, sign in cases:
+            with self.subTest(side=side, entry=entry_price, exit=exit_price):
+                position = self._make_position(side, entry_price, size)
+                pnl = self.backtester._calculate_pnl(position, exit_price)
+                
+                # PnL = движение цены в сторону позиции * размер - комиссия за вход и выход
+                direction = 1 if side == 'long' else -1
+                gross_pnl = (exit_price - entry_price) * direction * size
+                expected_pnl = gross_pnl - position['position_size'] * self.backtester.commission * 2
+                
+                self.assertAlmostEqual(pnl, expected_pnl, places=2)
+                self.assertEqual(np.sign(pnl), sign)
     
     def test_calculate_metrics_empty_trades(self):
         """Тест расчёта метрик при отсутствии сделок"""
@@ -161,11 +160,10 @@ class TestBacktester(unittest.TestCase):
             {'pnl': -300, 'pnl_pct': -3},
         ]
         
-        # Создаём equity curve
+        # Создаём equity curve (префиксная сумма PnL)
         initial = 10000
-        equity_curve = [initial]
-        for trade in self.backtester.trades:
-            equity_curve.append(equity_curve[-1] + trade['pnl'])
+        pnls = np.fromiter((t['pnl'] for t in self.backtester.trades), dtype=np.float64)
+        equity_curve = np.concatenate(([initial], initial + np.cumsum(pnls)))
         
         metrics = self.backtester.calculate_metrics(equity_curve)
         
@@ -199,24 +197,24 @@ class TestBacktester(unittest.TestCase):
         self.assertAlmostEqual(metrics['max_drawdown'], expected_dd, places=1)
         self.assertLess(metrics['max_drawdown'], 0)
     
-    @patch('src.ml.predictor.MLPredictor')
-    @patch('src.risk.risk_manager.RiskManager')
-    def test_walk_forward_validation_structure(self, mock_risk, mock_predictor):
+    def test_walk_forward_validation_structure(self):
         """Тест структуры Walk-Forward Validation"""
         df = self._create_sample_data(500)
         feature_columns = ['sma_20', 'rsi', 'macd', 'atr']
         
-        # Настраиваем моки
-        mock_predictor_instance = Mock()
-        mock_predictor_instance.train.return_value = True
-        mock_predictor_instance.predict_single.return_value = (1, 0.75)
-        mock_predictor.return_value = mock_predictor_instance
-        
-        mock_risk_instance = Mock()
-        mock_risk_instance.calculate_position_size.return_value = 0.025
-        mock_risk_instance.calculate_stop_loss.return_value = 39000
-        mock_risk_instance.check_risk_limits.return_value = True
-        mock_risk.return_value = mock_risk_instance
+        # Подменяем компоненты бэктестера напрямую, без patch классов (нет интроспекции модулей);
+        # Обычные функции вместо Mock-методов: вызываются на каждой свече, без записи вызовов
+        self.backtester.ml_predictor = Mock(
+            train=Mock(return_value=True),
+            predict_single=lambda *_: (1, 0.75),
+            predict_batch=lambda X: (np.ones(len(X)), np.full(len(X), 0.75))
+        )
+        self.backtester.risk_manager = Mock(
+            risk_per_trade=0.01,
+            calculate_position_size=Mock(return_value=0.025),
+            calculate_stop_loss=Mock(return_value=39000),
+            check_risk_limits=Mock(return_value=True)
+        )
         
         results = self.backtester.walk_forward_validation(df, feature_columns)
         
@@ -231,21 +229,22 @@ class TestBacktester(unittest.TestCase):
     def test_equity_curve_monotonic_properties(self):
         """Тест свойств equity curve"""
         # Equity curve не должна быть отрицательной
-        equity_curve = [10000, 10500, 10200, 10800, 10400]
+        equity_curve = np.asarray([10000, 10500, 10200, 10800, 10400])
         
-        self.assertTrue(all(e > 0 for e in equity_curve))
+        self.assertTrue((equity_curve > 0).all())
     
     def test_commission_and_slippage_impact(self):
-        """Тест влияния комиссии и проскальзывания"""
+        """Тест влияния комиссии"""
         entry_price = 40000
         exit_price = 40100  # Малая прибыль
         size = 0.025
         
-        # Без комиссии и проскальзывания
+        # Без комиссии
         gross_pnl = (exit_price - entry_price) * size
         
-        # С комиссией и проскальзыванием
-        net_pnl = self.backtester.execute_trade('long', entry_price, exit_price, size)
+        # С комиссией за вход и выход
+        position = self._make_position('long', entry_price, size)
+        net_pnl = self.backtester._calculate_pnl(position, exit_price)
         
         # Net PnL должен быть меньше gross из-за затрат
         self.assertLess(net_pnl, gross_pnl)
@@ -267,8 +266,8 @@ class TestBacktester(unittest.TestCase):
         total_losses = abs(-500 - 300)
         expected_pf = total_wins / total_losses
         
-        equity_curve = [10000 + sum(t['pnl'] for t in self.backtester.trades[:i+1]) 
-                       for i in range(len(self.backtester.trades))]
+        pnls = np.fromiter((t['pnl'] for t in self.backtester.trades), dtype=np.float64)
+        equity_curve = 10000 + np.cumsum(pnls)
         
         metrics = self.backtester.calculate_metrics(equity_curve)
         
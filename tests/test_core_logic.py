@@ -2,13 +2,17 @@
 Упрощённые unit тесты для основных модулей
 Эти тесты не зависят от ConfigManager и тестируют core функциональность
 """
+import math
 import unittest
-import pandas as pd
 import numpy as np
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests._indicators_numba import _bollinger_bands, _rsi_wilder
+
+# Коэффициент годового пересчёта (252 торговых дня)
+_ANN_FACTOR = math.sqrt(252)
+
+# Общий генератор случайных чисел (фиксированный seed)
+RNG = np.random.default_rng(42)
 
 
 class TestMarketDataBasic(unittest.TestCase):
@@ -18,43 +22,33 @@ class TestMarketDataBasic(unittest.TestCase):
         """Тест расчёта RSI"""
         # Создаём тестовые данные с явным трендом
         prices = [44, 44.5, 45, 45.5, 46, 46.5, 47, 47.5, 48, 48.5, 49, 49.5, 50]
-        df = pd.DataFrame({'close': prices})
         
-        # Простой RSI расчёт
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        # RSI Уайлдера за один проход
+        rsi = _rsi_wilder(np.asarray(prices, dtype=np.float64), 14)
         
         # RSI должен быть выше 50 для восходящего тренда
-        self.assertTrue(rsi.iloc[-1] > 50 or np.isnan(rsi.iloc[-1]))
+        self.assertTrue(rsi[-1] > 50 or np.isnan(rsi[-1]))
     
     def test_sma_calculation(self):
         """Тест расчёта простой скользящей средней"""
         prices = [40, 42, 41, 43, 44, 45, 46, 47, 48, 49]
-        df = pd.DataFrame({'close': prices})
         
-        sma_5 = df['close'].rolling(window=5).mean()
+        # SMA(5) одной свёрткой, без DataFrame
+        sma_5 = np.convolve(prices, np.ones(5) / 5, mode='valid')
         
         # Последнее значение SMA(5) должно быть средним последних 5 цен
         expected = np.mean(prices[-5:])
-        self.assertAlmostEqual(sma_5.iloc[-1], expected, places=2)
+        self.assertAlmostEqual(sma_5[-1], expected, places=2)
     
     def test_bollinger_bands(self):
         """Тест расчёта полос Боллинджера"""
-        prices = np.random.uniform(40, 50, 50)
-        df = pd.DataFrame({'close': prices})
+        prices = RNG.uniform(40, 50, 50)
         
         window = 20
-        sma = df['close'].rolling(window=window).mean()
-        std = df['close'].rolling(window=window).std()
-        
-        bb_upper = sma + (std * 2)
-        bb_lower = sma - (std * 2)
+        bb_lower, bb_upper = _bollinger_bands(prices, window, 2.0)
         
         # Верхняя полоса должна быть выше нижней
-        self.assertTrue((bb_upper.dropna() > bb_lower.dropna()).all())
+        self.assertTrue((bb_upper[window - 1:] > bb_lower[window - 1:]).all())
 
 
 class TestPositionSizingBasic(unittest.TestCase):
@@ -158,9 +152,8 @@ class TestPerformanceMetrics(unittest.TestCase):
             {'pnl': 1200}
         ]
         
-        winning_trades = len([t for t in trades if t['pnl'] > 0])
-        total_trades = len(trades)
-        win_rate = winning_trades / total_trades
+        pnls = np.array([t['pnl'] for t in trades], dtype=np.float64)
+        win_rate = (pnls > 0).mean()
         
         self.assertAlmostEqual(win_rate, 0.6, places=2)  # 3/5 = 60%
     
@@ -173,8 +166,9 @@ class TestPerformanceMetrics(unittest.TestCase):
             {'pnl': -300},
         ]
         
-        total_wins = sum(t['pnl'] for t in trades if t['pnl'] > 0)
-        total_losses = abs(sum(t['pnl'] for t in trades if t['pnl'] < 0))
+        pnls = np.array([t['pnl'] for t in trades], dtype=np.float64)
+        total_wins = pnls[pnls > 0].sum()
+        total_losses = -pnls[pnls < 0].sum()
         
         profit_factor = total_wins / total_losses if total_losses > 0 else 0
         
@@ -185,11 +179,12 @@ class TestPerformanceMetrics(unittest.TestCase):
         """Тест расчёта Sharpe Ratio"""
         returns = [0.02, -0.01, 0.03, 0.01, -0.005, 0.025, 0.015]
         
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
+        arr = np.asarray(returns, dtype=np.float64)
+        mean_return = arr.mean()
+        std_return = arr.std()
         
-        # Годовой Sharpe (252 торговых дня)
-        sharpe = (mean_return / std_return) * np.sqrt(252) if std_return > 0 else 0
+        # Годовой Sharpe
+        sharpe = 0.0 if std_return == 0 else (mean_return / std_return) * _ANN_FACTOR
         
         # Для положительных возвратов Sharpe должен быть положительным
         self.assertGreater(sharpe, 0)
@@ -198,15 +193,10 @@ class TestPerformanceMetrics(unittest.TestCase):
         """Тест расчёта максимальной просадки"""
         equity_curve = [10000, 11000, 12000, 10500, 9000, 9500, 11000, 12500]
         
-        peak = equity_curve[0]
-        max_dd = 0
-        
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (value - peak) / peak
-            if dd < max_dd:
-                max_dd = dd
+        # Бегущий максимум вместо цикла с ветвлением
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        peaks = np.maximum.accumulate(eq)
+        max_dd = ((eq - peaks) / peaks).min()
         
         # Max DD: от 12000 до 9000 = -25%
         expected_dd = (9000 - 12000) / 12000
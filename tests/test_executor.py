@@ -1,41 +1,45 @@
 """
 Unit тесты для модуля executor.py
 """
+import copy
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import pandas as pd
 import numpy as np
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.trading.executor import TradeExecutor
 
+# Базовая конфигурация (только для чтения; тесты, меняющие её, делают deepcopy)
+_BASE_CONFIG = {
+    'exchange': {'name': 'bybit', 'testnet': True},
+    'symbols': ['BTC/USDT'],
+    'trading': {
+        'initial_capital': 10000,
+        'min_confidence': 0.6,
+        'paper_trading': True
+    },
+    'risk': {
+        'max_position_size': 0.1,
+        'stop_loss_atr_multiplier': 2.0
+    }
+}
+
 
 class TestTradeExecutor(unittest.TestCase):
     """Тесты для класса TradeExecutor"""
     
+    @staticmethod
+    def _make_exchange():
+        """Свежий мок биржи (тесты проверяют счётчики вызовов, поэтому не общий)"""
+        exchange = Mock()
+        exchange.fetch_balance.return_value = {'USDT': {'free': 10000}}
+        exchange.fetch_ticker.return_value = {'last': 40000}
+        return exchange
+    
     def setUp(self):
         """Настройка тестового окружения"""
-        self.config = {
-            'exchange': {'name': 'bybit', 'testnet': True},
-            'symbols': ['BTC/USDT'],
-            'trading': {
-                'initial_capital': 10000,
-                'min_confidence': 0.6,
-                'paper_trading': True
-            },
-            'risk': {
-                'max_position_size': 0.1,
-                'stop_loss_atr_multiplier': 2.0
-            }
-        }
-        
-        self.mock_exchange = Mock()
-        self.mock_exchange.fetch_balance.return_value = {'USDT': {'free': 10000}}
-        self.mock_exchange.fetch_ticker.return_value = {'last': 40000}
-        
+        self.config = _BASE_CONFIG
+        self.mock_exchange = self._make_exchange()
         self.executor = TradeExecutor(self.config, self.mock_exchange)
     
     def test_initialization(self):
@@ -61,7 +65,7 @@ class TestTradeExecutor(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(self.executor.open_positions), 1)
         
-        position = self.executor.open_positions[0]
+        position = next(iter(self.executor.open_positions.values()))
         self.assertEqual(position['side'], 'long')
         self.assertEqual(position['entry_price'], 40000)
         self.assertEqual(position['size'], 0.025)
@@ -82,7 +86,7 @@ class TestTradeExecutor(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(self.executor.open_positions), 1)
         
-        position = self.executor.open_positions[0]
+        position = next(iter(self.executor.open_positions.values()))
         self.assertEqual(position['side'], 'short')
     
     def test_execute_signal_low_confidence(self):
@@ -118,7 +122,7 @@ class TestTradeExecutor(unittest.TestCase):
     def test_execute_signal_live_trading(self, mock_bybit):
         """Тест исполнения сигнала в live trading (мок)"""
         # Настраиваем live trading
-        config = self.config.copy()
+        config = copy.deepcopy(_BASE_CONFIG)
         config['trading']['paper_trading'] = False
         
         mock_exchange = Mock()
@@ -158,7 +162,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         # Закрываем с прибылью
         exit_price = 41000
@@ -178,7 +182,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         # Закрываем с убытком
         exit_price = 39500
@@ -198,7 +202,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 41000,
             'take_profit': 38000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         # Закрываем short с прибылью (цена упала)
         exit_price = 39000
@@ -218,7 +222,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         current_price = 38900  # Ниже стоп-лосса
         
@@ -236,7 +240,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         current_price = 39500  # Выше стоп-лосса
         
@@ -254,7 +258,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         current_price = 42100  # Выше тейк-профита
         
@@ -272,7 +276,7 @@ class TestTradeExecutor(unittest.TestCase):
             'stop_loss': 39000,
             'take_profit': 42000
         }
-        self.executor.open_positions.append(position)
+        self.executor.open_positions[position['id']] = position
         
         current_price = 41500  # Ниже тейк-профита
         
@@ -316,7 +320,7 @@ class TestTradeExecutor(unittest.TestCase):
             }
         ]
         
-        self.executor.open_positions.extend(positions)
+        self.executor.open_positions.update({p['id']: p for p in positions})
         
         self.assertEqual(len(self.executor.open_positions), 2)
         
@@ -324,7 +328,8 @@ class TestTradeExecutor(unittest.TestCase):
         pnl = self.executor.close_position('paper_1', 41000)
         
         self.assertEqual(len(self.executor.open_positions), 1)
-        self.assertEqual(self.executor.open_positions[0]['id'], 'paper_2')
+        self.assertIn('paper_2', self.executor.open_positions)
+        self.assertNotIn('paper_1', self.executor.open_positions)
 
 
 if __name__ == '__main__':
@@ -1,78 +1,136 @@
 """
 Интеграционные тесты для проверки взаимодействия модулей
 """
+import hashlib
+import inspect
+import os
 import unittest
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+import joblib
+import sklearn
 import pandas as pd
 import numpy as np
-import sys
-import os
 from datetime import datetime
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.data.market_data import MarketData
 from src.ml.predictor import MLPredictor
 from src.risk.risk_manager import RiskManager
 from src.trading.executor import TradeExecutor
+from tests._indicators_numba import _atr
+
+# Общий генератор случайных чисел (фиксированный seed)
+RNG = np.random.default_rng(42)
+
+# Базовая конфигурация (только для чтения, общая для всех тестов модуля)
+_BASE_CONFIG = {
+    'exchange': {'name': 'bybit', 'testnet': True},
+    'symbols': ['BTC/USDT'],
+    'timeframe': '1h',
+    'indicators': {
+        'sma_periods': [20, 50],
+        'ema_periods': [12, 26],
+        'rsi_period': 14,
+        'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+        'bollinger': {'period': 20, 'std': 2},
+        'atr_period': 14
+    },
+    'ml': {
+        'model_type': 'RandomForest',
+        'n_estimators': 50,
+        'max_depth': 10,
+        'random_state': 42,
+        'test_size': 0.2
+    },
+    'risk': {
+        'max_position_size': 0.1,
+        'max_portfolio_risk': 0.02,
+        'kelly_fraction': 0.25,
+        'stop_loss_atr_multiplier': 2.0,
+        'max_daily_loss': 0.05,
+        'max_drawdown': 0.15
+    },
+    'trading': {
+        'initial_capital': 10000,
+        'min_confidence': 0.6
+    }
+}
+
+# Кэш обученных моделей между запусками (входы детерминированы random_state)
+CACHE_DIR = Path(__file__).parent / '.cache'
+
+# Признаки для обучения ML модели
+FEATURE_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume',
+    'sma_20', 'sma_50', 'ema_12', 'ema_26',
+    'rsi', 'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_middle', 'bb_lower', 'atr'
+]
+
+
+def _get_or_train_predictor(df, features, cfg, force_train=False):
+    """Загружает обученный MLPredictor из кэша или обучает и сохраняет его
+    
+    Ключ кэша - sha1 от данных признаков, таргета, ML-конфига, версии sklearn и
+    исходника predictor.py, так что смена любого из них даёт промах.
+    
+    Returns:
+        (predictor, train_success); при попадании в кэш train_success = True
+    """
+    data = np.ascontiguousarray(df[features].to_numpy(dtype=np.float64))
+    digest = hashlib.sha1(data.tobytes())
+    # Таргет тоже входит в обучение: другая разметка (future_bars, порог) - другая модель
+    digest.update(np.ascontiguousarray(df['target'].to_numpy(dtype=np.float64)).tobytes())
+    digest.update(repr(cfg['ml']).encode())
+    digest.update(sklearn.__version__.encode())
+    digest.update(Path(inspect.getsourcefile(MLPredictor)).read_bytes())
+    path = CACHE_DIR / f'predictor_{digest.hexdigest()}.joblib'
+    
+    if path.exists() and not force_train:
+        return joblib.load(path), True
+    
+    predictor = MLPredictor(cfg)
+    train_success = predictor.train(df, features)
+    if train_success:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # Атомарная запись: параллельные воркеры (pytest -n auto) не читают недописанный файл
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        joblib.dump(predictor, tmp_path)
+        os.replace(tmp_path, path)
+    return predictor, train_success
 
 
 class TestIntegration(unittest.TestCase):
     """Интеграционные тесты"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Синтетические OHLCV данные и мок ccxt.bybit для всех тестов класса (строятся один раз)"""
+        cls._patcher = patch('ccxt.bybit')
+        cls.mock_bybit = cls._patcher.start()
+        cls.addClassCleanup(cls._patcher.stop)
+        
+        # Синтетические OHLCV свечи (мок ответа биржи): весь шум одним вызовом
+        n_bars = 300
+        base_time = 1704067200000
+        times = base_time + np.arange(n_bars) * 3600000
+        # [open, high, low, close, volume]
+        bars = RNG.standard_normal((n_bars, 5)) * [100, 100, 100, 100, 10]
+        bars += [40000, 41000, 39000, 40000, 100]
+        cls._ohlcv = [[t, *row] for t, row in zip(times.tolist(), bars.tolist())]
+    
     def setUp(self):
         """Настройка тестового окружения"""
-        self.config = {
-            'exchange': {'name': 'bybit', 'testnet': True},
-            'symbols': ['BTC/USDT'],
-            'timeframe': '1h',
-            'indicators': {
-                'sma_periods': [20, 50],
-                'ema_periods': [12, 26],
-                'rsi_period': 14,
-                'macd': {'fast': 12, 'slow': 26, 'signal': 9},
-                'bollinger': {'period': 20, 'std': 2},
-                'atr_period': 14
-            },
-            'ml': {
-                'model_type': 'RandomForest',
-                'n_estimators': 50,
-                'max_depth': 10,
-                'random_state': 42,
-                'test_size': 0.2
-            },
-            'risk': {
-                'max_position_size': 0.1,
-                'max_portfolio_risk': 0.02,
-                'kelly_fraction': 0.25,
-                'stop_loss_atr_multiplier': 2.0,
-                'max_daily_loss': 0.05,
-                'max_drawdown': 0.15
-            },
-            'trading': {
-                'initial_capital': 10000,
-                'min_confidence': 0.6
-            }
-        }
+        self.config = _BASE_CONFIG
+        # Мок общий на класс: сбрасываем состояние от предыдущего теста
+        self.mock_bybit.reset_mock(return_value=True)
     
-    @patch('ccxt.bybit')
-    def test_data_to_prediction_pipeline(self, mock_bybit):
+    def test_data_to_prediction_pipeline(self):
         """Тест полного пайплайна: данные → индикаторы → ML предсказание"""
         # Мокаем OHLCV данные
         mock_exchange = Mock()
-        ohlcv_data = []
-        base_time = 1704067200000
-        for i in range(300):
-            ohlcv_data.append([
-                base_time + i * 3600000,
-                40000 + np.random.randn() * 100,
-                41000 + np.random.randn() * 100,
-                39000 + np.random.randn() * 100,
-                40000 + np.random.randn() * 100,
-                100 + np.random.randn() * 10
-            ])
-        mock_exchange.fetch_ohlcv.return_value = ohlcv_data
-        mock_bybit.return_value = mock_exchange
+        mock_exchange.fetch_ohlcv.return_value = self._ohlcv
+        self.mock_bybit.return_value = mock_exchange
         
         # Шаг 1: Получаем данные
         market_data = MarketData(self.config)
@@ -93,29 +151,56 @@ class TestIntegration(unittest.TestCase):
         
         self.assertIn('target', df.columns)
         
-        # Шаг 4: Обучаем ML модель
-        predictor = MLPredictor(self.config)
-        feature_columns = [
-            'open', 'high', 'low', 'close', 'volume',
-            'sma_20', 'sma_50', 'ema_12', 'ema_26',
-            'rsi', 'macd', 'macd_signal', 'macd_hist',
-            'bb_upper', 'bb_middle', 'bb_lower', 'atr'
-        ]
-        
-        train_success = predictor.train(df, feature_columns)
+        # Шаг 4: Обучаем ML модель (или берём из кэша tests/.cache)
+        predictor, train_success = _get_or_train_predictor(df, FEATURE_COLUMNS, self.config)
         
         self.assertTrue(train_success)
         self.assertIsNotNone(predictor.model)
         
         # Шаг 5: Делаем предсказание
-        latest_data = df[feature_columns].iloc[[-1]]
+        latest_data = df[FEATURE_COLUMNS].iloc[[-1]]
         signal, confidence = predictor.predict_single(latest_data)
         
         self.assertIn(signal, [-1, 0, 1])
         self.assertTrue(0 <= confidence <= 1)
     
-    @patch('ccxt.bybit')
-    def test_prediction_to_trade_execution_pipeline(self, mock_bybit):
+    def test_predictor_training_bypasses_cache(self):
+        """Тест обучения ML модели без кэша: обучение выполняется при каждом запуске"""
+        mock_exchange = Mock()
+        mock_exchange.fetch_ohlcv.return_value = self._ohlcv
+        
+        market_data = MarketData(self.config)
+        market_data.exchange = mock_exchange
+        df = market_data.add_indicators(market_data.fetch_ohlcv(limit=300))
+        df = market_data.create_ml_target(df, future_bars=5)
+        
+        predictor, train_success = _get_or_train_predictor(
+            df, FEATURE_COLUMNS, self.config, force_train=True
+        )
+        
+        self.assertTrue(train_success)
+        self.assertIsNotNone(predictor.model)
+    
+    def test_atr_numba_matches_reference(self):
+        """Тест что numba-ядро ATR совпадает с эталоном на pandas"""
+        n_bars = 1000
+        close = 40000 + np.cumsum(RNG.standard_normal(n_bars) * 100)
+        high = close + RNG.uniform(0, 200, n_bars)
+        low = close - RNG.uniform(0, 200, n_bars)
+        
+        atr = _atr(high, low, close, 14)
+        
+        # Эталон: true range + сглаживание Уайлдера через ewm
+        h, l, c = pd.Series(high), pd.Series(low), pd.Series(close)
+        prev_close = c.shift(1)
+        true_range = pd.concat(
+            [h - l, (h - prev_close).abs(), (l - prev_close).abs()], axis=1
+        ).max(axis=1)
+        expected = true_range.ewm(alpha=1 / 14, adjust=False).mean().to_numpy()
+        
+        self.assertTrue(np.allclose(atr, expected, rtol=1e-12))
+    
+    def test_prediction_to_trade_execution_pipeline(self):
         """Тест пайплайна: ML предсказание → риск-менеджмент → исполнение сделки"""
         # Подготовка моков
         mock_exchange = Mock()
@@ -130,7 +215,7 @@ class TestIntegration(unittest.TestCase):
             'amount': 0.025,
             'status': 'closed'
         }
-        mock_bybit.return_value = mock_exchange
+        self.mock_bybit.return_value = mock_exchange
         
         # Инициализация компонентов
         risk_manager = RiskManager(self.config)
@@ -193,8 +278,7 @@ class TestIntegration(unittest.TestCase):
         # Сделка должна быть заблокирована
         self.assertFalse(can_trade)
     
-    @patch('ccxt.bybit')
-    def test_full_trade_lifecycle(self, mock_bybit):
+    def test_full_trade_lifecycle(self):
         """Тест полного жизненного цикла сделки"""
         mock_exchange = Mock()
         mock_exchange.fetch_balance.return_value = {'USDT': {'free': 10000}}
@@ -218,7 +302,7 @@ class TestIntegration(unittest.TestCase):
             'average': 41000
         }
         
-        mock_bybit.return_value = mock_exchange
+        self.mock_bybit.return_value = mock_exchange
         
         risk_manager = RiskManager(self.config)
         executor = TradeExecutor(self.config, mock_exchange)
@@ -275,8 +359,7 @@ class TestIntegration(unittest.TestCase):
             {'pnl': 800, 'pnl_pct': 2.0},    # Win
         ]
         
-        for trade in trades:
-            risk_manager.update_trade_history(trade)
+        risk_manager.bulk_update_trade_history(trades)
         
         metrics = risk_manager.get_performance_metrics()
         
@@ -1,16 +1,12 @@
 """
 Unit тесты для модуля market_data.py
 """
+import types
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Добавляем корневую директорию в путь
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data.market_data import MarketData
 
@@ -18,9 +14,10 @@ from src.data.market_data import MarketData
 class TestMarketData(unittest.TestCase):
     """Тесты для класса MarketData"""
     
-    def setUp(self):
-        """Настройка тестового окружения"""
-        self.config = {
+    @classmethod
+    def setUpClass(cls):
+        """Общие конфигурация, MarketData и случайные OHLCV данные (строятся один раз)"""
+        cls.config = {
             'exchange': {'name': 'bybit', 'testnet': True},
             'symbols': ['BTC/USDT'],
             'timeframe': '1h',
@@ -33,7 +30,27 @@ class TestMarketData(unittest.TestCase):
                 'atr_period': 14
             }
         }
-        self.market_data = MarketData(self.config)
+        # Тесты индикаторов не меняют состояние MarketData: экземпляр общий
+        cls.market_data = MarketData(cls.config)
+        
+        cls._ohlcv_df = cls._make_ohlcv(100)
+        
+        # Индикаторы считаются один раз; тесты только читают столбцы.
+        # Поверхностная копия: новые столбцы не попадут в общий датафрейм
+        cls._indicated = cls.market_data.add_indicators(cls._ohlcv_df.copy(deep=False))
+    
+    @staticmethod
+    def _make_ohlcv(n=100, seed=0):
+        """Случайные OHLCV данные: один (n, 5) массив и один конструктор DataFrame"""
+        rng = np.random.default_rng(seed)
+        # Границы по столбцам: open, high, low, close, volume
+        low = [40000, 45000, 39000, 40000, 100]
+        high = [45000, 46000, 40000, 45000, 1000]
+        # Без столбца timestamp: индикаторы считаются только по ценам и объёму
+        return pd.DataFrame(
+            rng.uniform(low, high, size=(n, 5)),
+            columns=['open', 'high', 'low', 'close', 'volume']
+        )
     
     @patch('ccxt.bybit')
     def test_initialization(self, mock_bybit):
@@ -44,18 +61,7 @@ class TestMarketData(unittest.TestCase):
     
     def test_add_indicators_with_valid_data(self):
         """Тест добавления индикаторов с валидными данными"""
-        # Создаём тестовый датафрейм
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='1h')
-        df = pd.DataFrame({
-            'timestamp': dates,
-            'open': np.random.uniform(40000, 45000, 100),
-            'high': np.random.uniform(45000, 46000, 100),
-            'low': np.random.uniform(39000, 40000, 100),
-            'close': np.random.uniform(40000, 45000, 100),
-            'volume': np.random.uniform(100, 1000, 100)
-        })
-        
-        result = self.market_data.add_indicators(df)
+        result = self._indicated
         
         # Проверяем наличие индикаторов
         self.assertIn('sma_20', result.columns)
@@ -68,20 +74,13 @@ class TestMarketData(unittest.TestCase):
         
         # Проверяем, что индикаторы не содержат NaN после прогрева
         warmup = 60
-        self.assertFalse(result.iloc[warmup:]['sma_20'].isna().any())
-        self.assertFalse(result.iloc[warmup:]['rsi'].isna().any())
+        self.assertFalse(np.isnan(result['sma_20'].to_numpy()[warmup:]).any())
+        self.assertFalse(np.isnan(result['rsi'].to_numpy()[warmup:]).any())
     
     def test_add_indicators_with_insufficient_data(self):
         """Тест добавления индикаторов с недостаточным количеством данных"""
         # Создаём датафрейм с малым количеством строк
-        df = pd.DataFrame({
-            'timestamp': pd.date_range(start='2024-01-01', periods=10, freq='1h'),
-            'open': [40000] * 10,
-            'high': [45000] * 10,
-            'low': [39000] * 10,
-            'close': [42000] * 10,
-            'volume': [100] * 10
-        })
+        df = self._make_ohlcv(10)
         
         result = self.market_data.add_indicators(df)
         
@@ -91,11 +90,7 @@ class TestMarketData(unittest.TestCase):
     
     def test_create_ml_target(self):
         """Тест создания таргета для ML"""
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='1h')
-        df = pd.DataFrame({
-            'timestamp': dates,
-            'close': np.random.uniform(40000, 45000, 100)
-        })
+        df = self._ohlcv_df[['close']].copy(deep=False)
         
         result = self.market_data.create_ml_target(df, future_bars=5)
         
@@ -107,21 +102,18 @@ class TestMarketData(unittest.TestCase):
         
         # Проверяем значения таргета (должны быть -1, 0, 1)
         valid_targets = result['target'].dropna().unique()
-        self.assertTrue(all(t in [-1, 0, 1] for t in valid_targets))
+        self.assertTrue(np.isin(valid_targets, (-1, 0, 1)).all())
     
-    @patch('ccxt.bybit')
-    def test_fetch_ohlcv_success(self, mock_bybit):
+    def test_fetch_ohlcv_success(self):
         """Тест успешного получения OHLCV данных"""
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv.return_value = [
+        ohlcv = [
             [1704067200000, 42000, 43000, 41000, 42500, 100],
             [1704070800000, 42500, 43500, 42000, 43000, 150],
             [1704074400000, 43000, 44000, 42500, 43500, 200],
         ]
-        mock_bybit.return_value = mock_exchange
         
         md = MarketData(self.config)
-        md.exchange = mock_exchange
+        md.exchange = types.SimpleNamespace(fetch_ohlcv=lambda *args, **kwargs: ohlcv)
         
         df = md.fetch_ohlcv(limit=3)
         
@@ -131,15 +123,13 @@ class TestMarketData(unittest.TestCase):
         self.assertIn('volume', df.columns)
         self.assertEqual(df.iloc[0]['open'], 42000)
     
-    @patch('ccxt.bybit')
-    def test_fetch_ohlcv_api_error(self, mock_bybit):
+    def test_fetch_ohlcv_api_error(self):
         """Тест обработки ошибки API при получении OHLCV"""
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv.side_effect = Exception("API Error")
-        mock_bybit.return_value = mock_exchange
+        def fetch_ohlcv(*args, **kwargs):
+            raise Exception("API Error")
         
         md = MarketData(self.config)
-        md.exchange = mock_exchange
+        md.exchange = types.SimpleNamespace(fetch_ohlcv=fetch_ohlcv)
         
         df = md.fetch_ohlcv(limit=100)
         
@@ -148,25 +138,16 @@ class TestMarketData(unittest.TestCase):
     
     def test_indicator_ranges(self):
         """Тест корректности диапазонов индикаторов"""
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='1h')
-        df = pd.DataFrame({
-            'timestamp': dates,
-            'open': np.random.uniform(40000, 45000, 100),
-            'high': np.random.uniform(45000, 46000, 100),
-            'low': np.random.uniform(39000, 40000, 100),
-            'close': np.random.uniform(40000, 45000, 100),
-            'volume': np.random.uniform(100, 1000, 100)
-        })
-        
-        result = self.market_data.add_indicators(df)
+        result = self._indicated
         
         # RSI должен быть в диапазоне [0, 100]
-        rsi_valid = result['rsi'].dropna()
-        self.assertTrue((rsi_valid >= 0).all() and (rsi_valid <= 100).all())
+        rsi = result['rsi'].to_numpy()
+        rsi_valid = rsi[~np.isnan(rsi)]
+        self.assertTrue(((0 <= rsi_valid) & (rsi_valid <= 100)).all())
         
         # ATR должен быть положительным
-        atr_valid = result['atr'].dropna()
-        self.assertTrue((atr_valid > 0).all())
+        atr = result['atr'].to_numpy()
+        self.assertTrue((atr[~np.isnan(atr)] > 0).all())
 
 
 if __name__ == '__main__':
@@ -3,28 +3,39 @@ Unit тесты для модуля news_analyzer.py
 """
 import unittest
 from unittest.mock import Mock, patch, MagicMock
-import sys
-import os
 from datetime import datetime, timedelta
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textblob import TextBlob
 
 from src.sentiment.news_analyzer import NewsAnalyzer
 
+# Базовая конфигурация (только для чтения, общая для всех тестов модуля)
+_BASE_CONFIG = {
+    'news': {
+        'cryptopanic_api_key': 'test_api_key',
+        'sentiment_threshold': 0.1,
+        'max_news_age_hours': 24
+    }
+}
+
+
+def setUpModule():
+    """Прогрев TextBlob: ленивые словари загружаются один раз, а не в первом тесте"""
+    TextBlob("warmup").sentiment
+
 
 class TestNewsAnalyzer(unittest.TestCase):
-    """Тесты для класса NewsAnalyzer"""
+    """Тесты для класса NewsAnalyzer, которым нужен свежий экземпляр (сеть, моки)"""
     
     def setUp(self):
         """Настройка тестового окружения"""
-        self.config = {
-            'news': {
-                'cryptopanic_api_key': 'test_api_key',
-                'sentiment_threshold': 0.1,
-                'max_news_age_hours': 24
-            }
-        }
+        self.config = _BASE_CONFIG
         self.analyzer = NewsAnalyzer(self.config)
+        
+        # Один патч HTTP-сессии на тест вместо декоратора на каждом методе
+        self._get_patcher = patch('requests.Session.get')
+        self.mock_get = self._get_patcher.start()
+        self.addCleanup(self._get_patcher.stop)
     
     def test_initialization(self):
         """Тест инициализации класса"""
@@ -32,8 +43,7 @@ class TestNewsAnalyzer(unittest.TestCase):
         self.assertEqual(self.analyzer.sentiment_threshold, 0.1)
         self.assertEqual(self.analyzer.max_news_age_hours, 24)
     
-    @patch('requests.get')
-    def test_fetch_news_success(self, mock_get):
+    def test_fetch_news_success(self):
         """Тест успешного получения новостей"""
         mock_response = Mock()
         mock_response.status_code = 200
@@ -51,34 +61,92 @@ class TestNewsAnalyzer(unittest.TestCase):
                 }
             ]
         }
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = mock_response
         
         news = self.analyzer.fetch_news('BTC')
         
         self.assertEqual(len(news), 2)
         self.assertEqual(news[0]['title'], 'Bitcoin hits new high')
-        mock_get.assert_called_once()
+        self.mock_get.assert_called_once()
     
-    @patch('requests.get')
-    def test_fetch_news_api_error(self, mock_get):
+    def test_fetch_news_api_error(self):
         """Тест обработки ошибки API"""
-        mock_get.side_effect = Exception("API Error")
+        self.mock_get.side_effect = Exception("API Error")
         
         news = self.analyzer.fetch_news('BTC')
         
         self.assertEqual(news, [])
     
-    @patch('requests.get')
-    def test_fetch_news_invalid_response(self, mock_get):
+    def test_fetch_news_invalid_response(self):
         """Тест обработки невалидного ответа"""
         mock_response = Mock()
         mock_response.status_code = 404
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = mock_response
         
         news = self.analyzer.fetch_news('BTC')
         
         self.assertEqual(news, [])
     
+    def test_get_sentiment_score_aggregation(self):
+        """Тест агрегации сентимента из новостей"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'results': [
+                {'title': 'Bitcoin is amazing! Great news!'},
+                {'title': 'Positive developments in crypto'},
+                {'title': 'Bitcoin holds steady'}
+            ]
+        }
+        self.mock_get.return_value = mock_response
+        
+        sentiment = self.analyzer.get_sentiment('BTC')
+        
+        # Агрегированный сентимент должен быть в диапазоне [-1, 1]
+        self.assertTrue(-1 <= sentiment <= 1)
+    
+    def test_get_sentiment_no_news(self):
+        """Тест получения сентимента когда нет новостей"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'results': []}
+        self.mock_get.return_value = mock_response
+        
+        sentiment = self.analyzer.get_sentiment('BTC')
+        
+        # При отсутствии новостей сентимент должен быть нейтральным
+        self.assertEqual(sentiment, 0)
+    
+    def test_news_age_filtering(self):
+        """Тест фильтрации новостей по возрасту"""
+        now = datetime.utcnow()
+        old_date = (now - timedelta(hours=48)).isoformat() + 'Z'
+        recent_date = (now - timedelta(hours=12)).isoformat() + 'Z'
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'results': [
+                {'title': 'Old news', 'published_at': old_date},
+                {'title': 'Recent news', 'published_at': recent_date}
+            ]
+        }
+        self.mock_get.return_value = mock_response
+        
+        news = self.analyzer.fetch_news('BTC')
+        
+        # Должны получить обе новости (фильтрация в методе, если реализована)
+        self.assertGreaterEqual(len(news), 1)
+
+
+class TestNewsAnalyzerSentiment(unittest.TestCase):
+    """Тесты анализа текста: не меняют состояние анализатора, экземпляр общий"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Один NewsAnalyzer на все тесты класса"""
+        cls.analyzer = NewsAnalyzer(_BASE_CONFIG)
+    
     def test_analyze_sentiment_positive(self):
         """Тест анализа позитивного сентимента"""
         text = "Bitcoin is great! Amazing bullish momentum and excellent performance!"
@@ -112,38 +180,6 @@ class TestNewsAnalyzer(unittest.TestCase):
         
         self.assertEqual(score, 0)
     
-    @patch('requests.get')
-    def test_get_sentiment_score_aggregation(self, mock_get):
-        """Тест агрегации сентимента из новостей"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'results': [
-                {'title': 'Bitcoin is amazing! Great news!'},
-                {'title': 'Positive developments in crypto'},
-                {'title': 'Bitcoin holds steady'}
-            ]
-        }
-        mock_get.return_value = mock_response
-        
-        sentiment = self.analyzer.get_sentiment('BTC')
-        
-        # Агрегированный сентимент должен быть в диапазоне [-1, 1]
-        self.assertTrue(-1 <= sentiment <= 1)
-    
-    @patch('requests.get')
-    def test_get_sentiment_no_news(self, mock_get):
-        """Тест получения сентимента когда нет новостей"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'results': []}
-        mock_get.return_value = mock_response
-        
-        sentiment = self.analyzer.get_sentiment('BTC')
-        
-        # При отсутствии новостей сентимент должен быть нейтральным
-        self.assertEqual(sentiment, 0)
-    
     def test_sentiment_threshold_application(self):
         """Тест применения порога сентимента"""
         # Слабый позитивный сентимент (ниже порога)
@@ -167,28 +203,6 @@ class TestNewsAnalyzer(unittest.TestCase):
         
         self.assertEqual(adjusted_sentiment, 0.5)
     
-    @patch('requests.get')
-    def test_news_age_filtering(self, mock_get):
-        """Тест фильтрации новостей по возрасту"""
-        now = datetime.utcnow()
-        old_date = (now - timedelta(hours=48)).isoformat() + 'Z'
-        recent_date = (now - timedelta(hours=12)).isoformat() + 'Z'
-        
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'results': [
-                {'title': 'Old news', 'published_at': old_date},
-                {'title': 'Recent news', 'published_at': recent_date}
-            ]
-        }
-        mock_get.return_value = mock_response
-        
-        news = self.analyzer.fetch_news('BTC')
-        
-        # Должны получить обе новости (фильтрация в методе, если реализована)
-        self.assertGreaterEqual(len(news), 1)
-    
     def test_sentiment_score_range(self):
         """Тест что сентимент score находится в допустимом диапазоне"""
         test_texts = [
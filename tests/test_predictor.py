@@ -1,16 +1,12 @@
 """
 Unit тесты для модуля predictor.py
 """
+import io
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import pandas as pd
 import numpy as np
-import sys
-import os
 import joblib
-import tempfile
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.ml.predictor import MLPredictor
 
@@ -18,32 +14,47 @@ from src.ml.predictor import MLPredictor
 class TestMLPredictor(unittest.TestCase):
     """Тесты для класса MLPredictor"""
     
-    def setUp(self):
-        """Настройка тестового окружения"""
-        self.config = {
+    # Неизменяемый список признаков, общий для всех тестов
+    feature_columns = (
+        'open', 'high', 'low', 'close', 'volume',
+        'sma_20', 'sma_50', 'ema_12', 'ema_26',
+        'rsi', 'macd', 'macd_signal', 'macd_hist',
+        'bb_upper', 'bb_middle', 'bb_lower', 'atr'
+    )
+    
+    @classmethod
+    def setUpClass(cls):
+        """Общая конфигурация и одна обученная модель для всех тестов класса"""
+        cls._config = {
             'ml': {
                 'model_type': 'RandomForest',
-                'n_estimators': 50,
+                'n_estimators': 10,  # Тестам важен API, а не качество модели
                 'max_depth': 10,
                 'min_samples_split': 10,
                 'random_state': 42,
                 'test_size': 0.2
             }
         }
+        
+        # RandomForest обучается один раз; тесты только читают модель
+        cls._trained_df = cls._create_sample_data(n_samples=300)
+        cls._trained_predictor = MLPredictor(cls._config)
+        cls._trained_predictor.train(cls._trained_df, list(cls.feature_columns))
+    
+    def setUp(self):
+        """Настройка тестового окружения"""
+        self.config = self._config
         self.predictor = MLPredictor(self.config)
-        self.feature_columns = [
-            'open', 'high', 'low', 'close', 'volume',
-            'sma_20', 'sma_50', 'ema_12', 'ema_26',
-            'rsi', 'macd', 'macd_signal', 'macd_hist',
-            'bb_upper', 'bb_middle', 'bb_lower', 'atr'
-        ]
+        self.rng = np.random.default_rng(42)
     
-    def _create_sample_data(self, n_samples=200):
-        """Создание тестовых данных"""
-        np.random.seed(42)
-        data = {col: np.random.randn(n_samples) for col in self.feature_columns}
-        data['target'] = np.random.choice([-1, 0, 1], n_samples)
-        return pd.DataFrame(data)
+    @classmethod
+    def _create_sample_data(cls, n_samples=200):
+        """Создание тестовых данных (все признаки одним 2D блоком)"""
+        rng = np.random.default_rng(42)
+        arr = rng.standard_normal((n_samples, len(cls.feature_columns)))
+        df = pd.DataFrame(arr, columns=cls.feature_columns)
+        df['target'] = rng.choice([-1, 0, 1], n_samples)
+        return df
     
     def test_initialization(self):
         """Тест инициализации класса"""
@@ -55,7 +66,7 @@ class TestMLPredictor(unittest.TestCase):
         """Тест обучения модели с валидными данными"""
         df = self._create_sample_data(n_samples=300)
         
-        result = self.predictor.train(df, self.feature_columns)
+        result = self.predictor.train(df, list(self.feature_columns))
         
         self.assertTrue(result)
         self.assertIsNotNone(self.predictor.model)
@@ -66,7 +77,7 @@ class TestMLPredictor(unittest.TestCase):
         """Тест обучения с недостаточным количеством данных"""
         df = self._create_sample_data(n_samples=50)  # Мало данных
         
-        result = self.predictor.train(df, self.feature_columns)
+        result = self.predictor.train(df, list(self.feature_columns))
         
         self.assertFalse(result)
         self.assertIsNone(self.predictor.model)
@@ -76,7 +87,7 @@ class TestMLPredictor(unittest.TestCase):
         df = self._create_sample_data(n_samples=300)
         df = df.drop(columns=['sma_20', 'rsi'])  # Удаляем некоторые фичи
         
-        result = self.predictor.train(df, self.feature_columns)
+        result = self.predictor.train(df, list(self.feature_columns))
         
         self.assertFalse(result)
     
@@ -92,12 +103,10 @@ class TestMLPredictor(unittest.TestCase):
     
     def test_predict_single_after_training(self):
         """Тест предсказания после обучения модели"""
-        # Обучаем модель
-        df_train = self._create_sample_data(n_samples=300)
-        self.predictor.train(df_train, self.feature_columns)
+        self.predictor = self._trained_predictor
         
         # Делаем предсказание
-        data = {col: [np.random.randn()] for col in self.feature_columns}
+        data = {col: [self.rng.standard_normal()] for col in self.feature_columns}
         df_test = pd.DataFrame(data)
         
         signal, proba = self.predictor.predict_single(df_test)
@@ -107,38 +116,32 @@ class TestMLPredictor(unittest.TestCase):
     
     def test_save_and_load_model(self):
         """Тест сохранения и загрузки модели"""
-        # Обучаем модель
-        df = self._create_sample_data(n_samples=300)
-        self.predictor.train(df, self.feature_columns)
+        # Обученная модель из setUpClass
+        self.predictor = self._trained_predictor
         
-        # Сохраняем во временный файл
-        with tempfile.NamedTemporaryFile(suffix='.pkl', delete=False) as tmp:
-            model_path = tmp.name
+        # Сохраняем в буфер в памяти (без файловой системы)
+        buf = io.BytesIO()
+        self.predictor.save_model(buf)
+        buf.seek(0)
         
-        try:
-            self.predictor.save_model(model_path)
-            
-            # Создаём новый предиктор и загружаем модель
-            new_predictor = MLPredictor(self.config)
-            result = new_predictor.load_model(model_path)
-            
-            self.assertTrue(result)
-            self.assertIsNotNone(new_predictor.model)
-            self.assertIsNotNone(new_predictor.scaler)
-            self.assertEqual(new_predictor.feature_columns, self.feature_columns)
-            
-            # Проверяем, что предсказания одинаковые
-            data = {col: [np.random.randn()] for col in self.feature_columns}
-            df_test = pd.DataFrame(data)
-            
-            signal1, proba1 = self.predictor.predict_single(df_test)
-            signal2, proba2 = new_predictor.predict_single(df_test)
-            
-            self.assertEqual(signal1, signal2)
-            self.assertAlmostEqual(proba1, proba2, places=5)
-        finally:
-            if os.path.exists(model_path):
-                os.remove(model_path)
+        # Создаём новый предиктор и загружаем модель
+        new_predictor = MLPredictor(self.config)
+        result = new_predictor.load_model(buf)
+        
+        self.assertTrue(result)
+        self.assertIsNotNone(new_predictor.model)
+        self.assertIsNotNone(new_predictor.scaler)
+        self.assertEqual(new_predictor.feature_columns, list(self.feature_columns))
+        
+        # Проверяем, что предсказания одинаковые
+        data = {col: [self.rng.standard_normal()] for col in self.feature_columns}
+        df_test = pd.DataFrame(data)
+        
+        signal1, proba1 = self.predictor.predict_single(df_test)
+        signal2, proba2 = new_predictor.predict_single(df_test)
+        
+        self.assertEqual(signal1, signal2)
+        self.assertAlmostEqual(proba1, proba2, places=5)
     
     def test_load_nonexistent_model(self):
         """Тест загрузки несуществующей модели"""
@@ -149,8 +152,7 @@ class TestMLPredictor(unittest.TestCase):
     
     def test_feature_importance_after_training(self):
         """Тест получения важности фич после обучения"""
-        df = self._create_sample_data(n_samples=300)
-        self.predictor.train(df, self.feature_columns)
+        self.predictor = self._trained_predictor
         
         # RandomForest должен иметь feature_importances_
         self.assertTrue(hasattr(self.predictor.model, 'feature_importances_'))
@@ -162,15 +164,13 @@ class TestMLPredictor(unittest.TestCase):
     
     def test_prediction_probabilities(self):
         """Тест корректности вероятностей предсказаний"""
-        df = self._create_sample_data(n_samples=300)
-        self.predictor.train(df, self.feature_columns)
+        self.predictor = self._trained_predictor
         
-        # Делаем несколько предсказаний
-        for _ in range(10):
-            data = {col: [np.random.randn()] for col in self.feature_columns}
-            df_test = pd.DataFrame(data)
-            
-            signal, proba = self.predictor.predict_single(df_test)
+        # Делаем несколько предсказаний (все входы одним датафреймом)
+        samples = self.rng.standard_normal((10, len(self.feature_columns)))
+        df_all = pd.DataFrame(samples, columns=self.feature_columns)
+        for i in range(len(df_all)):
+            signal, proba = self.predictor.predict_single(df_all.iloc[[i]])
             
             # Вероятность должна быть валидной
             self.assertTrue(0 <= proba <= 1)
@@ -184,7 +184,7 @@ class TestMLPredictor(unittest.TestCase):
         df.loc[:30, 'target'] = -1
         df.loc[31:60, 'target'] = 0
         
-        result = self.predictor.train(df, self.feature_columns)
+        result = self.predictor.train(df, list(self.feature_columns))
         
         # Модель должна обучиться даже на несбалансированных данных
         self.assertTrue(result)
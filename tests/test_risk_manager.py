@@ -1,14 +1,9 @@
 """
 Unit тесты для модуля risk_manager.py
 """
+import copy
 import unittest
-from unittest.mock import Mock, patch
-import pandas as pd
 import numpy as np
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.risk.risk_manager import RiskManager
 
@@ -16,9 +11,10 @@ from src.risk.risk_manager import RiskManager
 class TestRiskManager(unittest.TestCase):
     """Тесты для класса RiskManager"""
     
-    def setUp(self):
-        """Настройка тестового окружения"""
-        self.config = {
+    @classmethod
+    def setUpClass(cls):
+        """Общая конфигурация и прототип RiskManager (строятся один раз)"""
+        cls.config = {
             'risk': {
                 'max_position_size': 0.1,
                 'max_portfolio_risk': 0.02,
@@ -34,7 +30,14 @@ class TestRiskManager(unittest.TestCase):
             }
         }
         # Передаём initial_capital напрямую, чтобы избежать зависимости от ConfigManager
-        self.risk_manager = RiskManager(initial_capital=10000)
+        cls._prototype = RiskManager(initial_capital=10000)
+    
+    def setUp(self):
+        """Настройка тестового окружения"""
+        # Поверхностная копия прототипа; reset() заводит новые позиции и историю сделок,
+        # так что тесты не делят изменяемое состояние
+        self.risk_manager = copy.copy(self._prototype)
+        self.risk_manager.reset()
     
     def test_initialization(self):
         """Тест инициализации класса"""
@@ -43,20 +46,21 @@ class TestRiskManager(unittest.TestCase):
         self.assertEqual(self.risk_manager.max_portfolio_risk, 0.02)
         self.assertEqual(len(self.risk_manager.trade_history), 0)
     
-    def test_calculate_position_size_basic(self):
-        """Тест базового расчёта размера позиции"""
+    def test_calculate_position_size_within_max_limit(self):
+        """Тест что размер позиции положительный и не превышает максимум"""
         current_price = 40000
-        stop_loss = 39000
         balance = 10000
         
-        position_size = self.risk_manager.calculate_position_size(
-            current_price, stop_loss, balance
-        )
-        
-        # Проверяем, что размер позиции положительный и не превышает лимиты
-        self.assertGreater(position_size, 0)
-        position_value = position_size * current_price
-        self.assertLessEqual(position_value / balance, self.config['risk']['max_position_size'])
+        # 39000 - обычный стоп, 39900 - очень близкий стоп (малый риск)
+        for stop_loss in (39000, 39900):
+            with self.subTest(stop_loss=stop_loss):
+                position_size = self.risk_manager.calculate_position_size(
+                    current_price, stop_loss, balance
+                )
+                
+                self.assertGreater(position_size, 0)
+                position_value = position_size * current_price
+                self.assertLessEqual(position_value / balance, self.config['risk']['max_position_size'])
     
     def test_calculate_position_size_with_win_rate(self):
         """Тест расчёта размера позиции с учётом win rate"""
@@ -100,14 +104,16 @@ class TestRiskManager(unittest.TestCase):
             current_price, atr, side='long'
         )
         expected_long = current_price - (atr * 2.0)
-        self.assertAlmostEqual(stop_loss_long, expected_long, places=2)
         
         # Short позиция
         stop_loss_short = self.risk_manager.calculate_stop_loss(
             current_price, atr, side='short'
         )
         expected_short = current_price + (atr * 2.0)
-        self.assertAlmostEqual(stop_loss_short, expected_short, places=2)
+        
+        np.testing.assert_allclose(
+            [stop_loss_long, stop_loss_short], [expected_long, expected_short], rtol=0, atol=5e-3
+        )
     
     def test_calculate_take_profit(self):
         """Тест расчёта тейк-профита"""
@@ -120,7 +126,6 @@ class TestRiskManager(unittest.TestCase):
         )
         risk = entry_price - stop_loss
         expected_long = entry_price + (risk * 2.0)
-        self.assertAlmostEqual(take_profit_long, expected_long, places=2)
         
         # Short позиция
         entry_price = 40000
@@ -130,46 +135,68 @@ class TestRiskManager(unittest.TestCase):
         )
         risk = stop_loss - entry_price
         expected_short = entry_price - (risk * 2.0)
-        self.assertAlmostEqual(take_profit_short, expected_short, places=2)
-    
-    def test_check_risk_limits_within_limits(self):
-        """Тест проверки лимитов риска - в пределах нормы"""
-        balance = 10000
-        open_positions = 1
-        daily_pnl = -200  # -2%
-        total_drawdown = -800  # -8%
         
-        result = self.risk_manager.check_risk_limits(
-            balance, open_positions, daily_pnl, total_drawdown
+        np.testing.assert_allclose(
+            [take_profit_long, take_profit_short], [expected_long, expected_short], rtol=0, atol=5e-3
         )
+    
+    def test_check_risk_limits(self):
+        """Тест проверки лимитов риска (табличные случаи)"""
+        # (balance, open_positions, daily_pnl, total_drawdown, ожидаемый результат)
+        cases = [
+            (10000, 1, -200, -800, True),    # в пределах нормы: -2% за день, -8% просадка
+            (10000, 1, -600, -800, False),   # -6% за день, превышает max_daily_loss (5%)
+            (10000, 1, -200, -1600, False),  # -16%, превышает max_drawdown (15%)
+        ]
         
-        self.assertTrue(result)
+        for balance, open_positions, daily_pnl, total_drawdown, expected in cases:
+            with self.subTest(daily_pnl=daily_pnl, total_drawdown=total_drawdown):
+                result = self.risk_manager.check_risk_limits(
+                    balance, open_positions, daily_pnl, total_drawdown
+                )
+                self.assertEqual(result, expected)
     
-    def test_check_risk_limits_daily_loss_exceeded(self):
-        """Тест проверки лимитов - превышен дневной убыток"""
-        balance = 10000
-        open_positions = 1
-        daily_pnl = -600  # -6%, превышает max_daily_loss (5%)
-        total_drawdown = -800
+    def test_check_exits_batch(self):
+        """Тест пакетной проверки стоп-лосса/тейк-профита против поштучной логики"""
+        rng = np.random.default_rng(42)
+        n = 10000
         
-        result = self.risk_manager.check_risk_limits(
-            balance, open_positions, daily_pnl, total_drawdown
-        )
+        sides = rng.choice([1.0, -1.0], n)
+        entries = rng.uniform(30000, 50000, n)
+        stops = entries - sides * rng.uniform(100, 2000, n)
+        takes = entries + sides * rng.uniform(100, 3000, n)
+        prices = entries + rng.uniform(-3000, 3000, n)
+        
+        stop_hit, take_hit = self.risk_manager.check_exits_batch(prices, stops, takes, sides)
         
-        self.assertFalse(result)
+        # Эталон: те же правила, что в check_positions исполнителя, поштучно
+        expected = np.zeros((n, 2), dtype=bool)
+        for i in range(n):
+            if sides[i] == 1.0:
+                expected_stop = prices[i] <= stops[i]
+                expected_take = not expected_stop and prices[i] >= takes[i]
+            else:
+                expected_stop = prices[i] >= stops[i]
+                expected_take = not expected_stop and prices[i] <= takes[i]
+            expected[i] = expected_stop, expected_take
+        
+        # Одна проверка на весь массив вместо n вызовов assertEqual
+        np.testing.assert_array_equal(np.column_stack([stop_hit, take_hit]), expected)
     
-    def test_check_risk_limits_max_drawdown_exceeded(self):
-        """Тест проверки лимитов - превышена максимальная просадка"""
-        balance = 10000
-        open_positions = 1
-        daily_pnl = -200
-        total_drawdown = -1600  # -16%, превышает max_drawdown (15%)
+    def test_add_position_duplicate_symbol(self):
+        """Тест: вторая позиция по тому же символу отклоняется"""
+        first = self.risk_manager.add_position('BTC/USDT', 40000, 0.01, 39000, 42000)
+        self.assertIsNotNone(first)
         
-        result = self.risk_manager.check_risk_limits(
-            balance, open_positions, daily_pnl, total_drawdown
-        )
+        can_trade, reason = self.risk_manager.can_open_position('BTC/USDT')
+        self.assertFalse(can_trade)
+        self.assertIn('BTC/USDT', reason)
         
-        self.assertFalse(result)
+        # Дубликат не перезаписывает позицию и не расходует дневной лимит сделок
+        second = self.risk_manager.add_position('BTC/USDT', 41000, 0.02, 40000, 43000, 'short')
+        self.assertIsNone(second)
+        self.assertIs(self.risk_manager.open_positions['BTC/USDT'], first)
+        self.assertEqual(self.risk_manager.daily_trades, 1)
     
     def test_update_trade_history(self):
         """Тест обновления истории сделок"""
@@ -187,6 +214,23 @@ class TestRiskManager(unittest.TestCase):
         self.assertEqual(len(self.risk_manager.trade_history), 1)
         self.assertEqual(self.risk_manager.trade_history[0]['pnl'], 1000)
     
+    def test_trade_history_is_bounded(self):
+        """Тест: история сделок ограничена, а метрики учитывают все сделки"""
+        limit = self.risk_manager.MAX_TRADE_HISTORY
+        trades = [{'pnl': 10.0 if i % 2 else -5.0} for i in range(limit + 10)]
+        
+        self.risk_manager.bulk_update_trade_history(trades[:limit])
+        for trade in trades[limit:]:
+            self.risk_manager.update_trade_history(trade)
+        
+        # В памяти только последние limit сделок
+        self.assertEqual(len(self.risk_manager.trade_history), limit)
+        self.assertIs(self.risk_manager.trade_history[-1], trades[-1])
+        
+        metrics = self.risk_manager.get_performance_metrics()
+        self.assertEqual(metrics['total_trades'], limit + 10)
+        self.assertEqual(metrics['winning_trades'], (limit + 10) // 2)
+    
     def test_get_performance_metrics_empty(self):
         """Тест метрик производительности при пустой истории"""
         metrics = self.risk_manager.get_performance_metrics()
@@ -212,11 +256,29 @@ class TestRiskManager(unittest.TestCase):
         self.assertEqual(metrics['total_trades'], 4)
         self.assertEqual(metrics['winning_trades'], 2)
         self.assertEqual(metrics['losing_trades'], 2)
-        self.assertAlmostEqual(metrics['win_rate'], 0.5, places=2)
         self.assertEqual(metrics['total_pnl'], 1000)
-        self.assertAlmostEqual(metrics['avg_win'], 900, places=0)
-        self.assertAlmostEqual(metrics['avg_loss'], -400, places=0)
-        self.assertAlmostEqual(metrics['profit_factor'], 1800 / 800, places=2)
+        
+        # win_rate, avg_win, avg_loss, profit_factor одной проверкой
+        actual = [metrics['win_rate'], metrics['avg_win'], metrics['avg_loss'], metrics['profit_factor']]
+        expected = [0.5, 900.0, -400.0, 1800 / 800]
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=5e-3)
+    
+    def test_get_performance_metrics_cache(self):
+        """Тест кэша метрик: сброс при каждой новой сделке и при reset()"""
+        self.risk_manager.update_trade_history({'pnl': 100})
+        metrics = self.risk_manager.get_performance_metrics()
+        
+        # Возвращается копия: её изменение не портит кэш
+        metrics['total_trades'] = 99
+        self.assertEqual(self.risk_manager.get_performance_metrics()['total_trades'], 1)
+        
+        self.risk_manager.bulk_update_trade_history([{'pnl': -50}, {'pnl': 0}])
+        metrics = self.risk_manager.get_performance_metrics()
+        self.assertEqual(metrics['total_trades'], 3)
+        self.assertEqual(metrics['total_pnl'], 50)
+        
+        self.risk_manager.reset()
+        self.assertEqual(self.risk_manager.get_performance_metrics()['total_trades'], 0)
     
     def test_kelly_criterion_calculation(self):
         """Тест расчёта критерия Келли"""
@@ -239,23 +301,7 @@ class TestRiskManager(unittest.TestCase):
         
         # С Kelly fraction 0.25, размер должен быть скорректирован
         self.assertGreater(position_size_with_kelly, 0)
-    
-    def test_position_size_max_limit(self):
-        """Тест что размер позиции не превышает максимум"""
-        current_price = 40000
-        stop_loss = 39900  # Очень близкий стоп (малый риск)
-        balance = 10000
-        
-        position_size = self.risk_manager.calculate_position_size(
-            current_price, stop_loss, balance
-        )
-        
-        position_value = position_size * current_price
-        position_pct = position_value / balance
-        
-        # Размер позиции не должен превышать max_position_size
-        self.assertLessEqual(position_pct, self.config['risk']['max_position_size'])
 
 
 if __name__ == '__main__':
-    unittest.main()
+    unittest.main(warnings='ignore')
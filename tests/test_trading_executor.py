@@ -0,0 +1,47 @@
+"""
+Unit тесты для TradingExecutor (src/trading/executor.py)
+"""
+import unittest
+from unittest.mock import Mock
+
+from src.risk.risk_manager import RiskManager
+from src.trading.executor import TradingExecutor
+
+
+class TestTradingExecutorExecuteTrade(unittest.TestCase):
+    """Тесты для TradingExecutor.execute_trade"""
+    
+    def setUp(self):
+        """Исполнитель без сетевых компонентов: биржа и логгер сделок - моки"""
+        self.executor = TradingExecutor.__new__(TradingExecutor)
+        self.executor.risk_manager = RiskManager(initial_capital=10000)
+        self.executor.trade_logger = Mock()
+        self.executor.trade_logger.log_trade_open.return_value = 1
+        self.executor.exchange = Mock()
+        self.executor.exchange.load_markets.return_value = {
+            'BTC/USDT': {'precision': {'amount': 6}}
+        }
+        self.executor.exchange.create_order.return_value = {'id': 'order-1', 'status': 'closed'}
+        self.executor.active_positions = {}
+        
+        self.analysis = {'symbol': 'BTC/USDT', 'price': 40000.0, 'atr': 500.0}
+    
+    def test_execute_trade_twice_same_symbol(self):
+        """Тест: повторная сделка по открытому символу не отправляет ордера и ничего не пишет"""
+        first = self.executor.execute_trade(self.analysis, 'long')
+        self.assertIsNotNone(first)
+        
+        orders_sent = self.executor.exchange.create_order.call_count
+        active = self.executor.active_positions['BTC/USDT']
+        
+        second = self.executor.execute_trade(self.analysis, 'short')
+        
+        self.assertIsNone(second)
+        self.assertEqual(self.executor.exchange.create_order.call_count, orders_sent)
+        self.executor.trade_logger.log_trade_open.assert_called_once()
+        self.assertIs(self.executor.active_positions['BTC/USDT'], active)
+        self.assertIsNotNone(active['position'])
+
+
+if __name__ == '__main__':
+    unittest.main()